@@ -1,4 +1,31 @@
+import collections
 import copy
+import hashlib
+import multiprocessing
+from array import array
+
+
+def _precompute_tables(connection, walls, targets, board_size):
+    """
+    Calcule en arrière-plan, dans un processus séparé, les tables qui ne dépendent que des
+    murs : les cartes de distance (qui donnent aussi l'accessibilité de la cible, UNREACHABLE)
+    d'abord pour les cibles de la configuration puis pour toutes les cases.
+
+    Args:
+        connection (Connection): Extrémité du tube vers le plateau, qui reçoit des
+            dictionnaires case cible -> carte de distance.
+        walls (list): Murs de la configuration.
+        targets (list): Cibles de la configuration.
+        board_size (int): Taille du plateau.
+    """
+    board = Board({"walls": walls, "robots": [], "targets": targets}, board_size)
+    target_cells = [board.cell_index(target["position"]) for target in targets]
+
+    connection.send({cell: bytes(board.distance_map(cell)) for cell in target_cells})
+    other_cells = [cell for cell in range(board_size * board_size) if cell not in target_cells]
+    connection.send({cell: bytes(board.distance_map(cell)) for cell in other_cells})
+    connection.close()
+
 
 class Board:
     WALL_TOP = "T"
@@ -6,14 +33,30 @@ class Board:
     WALL_LEFT = "L"
     WALL_RIGHT = "R"
 
+    # Représentation compacte des murs : un bit par côté de case
+    WALL_BITS = {WALL_TOP: 1, WALL_BOTTOM: 2, WALL_LEFT: 4, WALL_RIGHT: 8}
+
+    # Pour chaque direction : (nom, bit du mur de passage, bit du mur bloquant, dy, dx)
+    DIRECTIONS = (
+        ("up", WALL_BITS[WALL_TOP], WALL_BITS[WALL_BOTTOM], -1, 0),
+        ("down", WALL_BITS[WALL_BOTTOM], WALL_BITS[WALL_TOP], 1, 0),
+        ("left", WALL_BITS[WALL_LEFT], WALL_BITS[WALL_RIGHT], 0, -1),
+        ("right", WALL_BITS[WALL_RIGHT], WALL_BITS[WALL_LEFT], 0, 1),
+    )
+
+    # Valeur des cartes de distance pour une case d'où la cible est inaccessible
+    UNREACHABLE = 255
+
     # Initialisation du plateau de jeu avec une configuration donnée
-    def __init__(self, configuration, board_size):
+    def __init__(self, configuration, board_size, precompute=False):
         """
         Initialise le plateau de jeu.
 
         Args:
             configuration (dict): Configuration initiale avec murs, robots et cibles.
             board_size (int): Taille du plateau (ex: 16x16).
+            precompute (bool): Si True, les cartes de distance sont calculées en arrière-plan
+                dans un autre processus (voir _precompute_tables).
         """
         # Création d'une grille vide
 
@@ -35,12 +78,253 @@ class Board:
         for wall in configuration["walls"]:
             self.board[wall[0]][wall[1]]["walls"].append(wall[2])
 
+        # Représentation compacte utilisée par les IA : un tableau plat indexé par y * BOARD_SIZE + x.
+        # La grille de dictionnaires n'est plus qu'une vue pour l'affichage (GameWindow).
+        self.wall_masks = bytearray(self.BOARD_SIZE * self.BOARD_SIZE)
+        self.center_mask = bytearray(self.BOARD_SIZE * self.BOARD_SIZE)
+        for y in range(self.BOARD_SIZE):
+            for x in range(self.BOARD_SIZE):
+                cell = self.board[y][x]
+                index = self.cell_index((y, x))
+                for wall in cell["walls"]:
+                    self.wall_masks[index] |= self.WALL_BITS[wall]
+                if cell["type"] == "M":
+                    self.center_mask[index] = 1
+
+        # Table des arrêts : pour chaque case et chaque direction, la case où le robot s'arrête
+        # en ne tenant compte que des murs et du centre (indice case * 4 + direction)
+        self.stop_table = self._compute_stop_table()
+
+        # Cartes de distance par case cible, calculées à la demande (voir distance_map)
+        self.distance_maps = {}
+        self._precomputation = None  # (tube, processus) du calcul en arrière-plan en cours
+
         # Robots et cibles
         self.robots = configuration["robots"]
         self.initial_config_robot = copy.deepcopy(configuration["robots"])
         self.targets = configuration["targets"]
         self.current_target_index = 0
 
+        if precompute:
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_precompute_tables, args=(sender, configuration["walls"], self.targets, board_size),
+                daemon=True,
+            )
+            process.start()
+            sender.close()
+            self._precomputation = (receiver, process)
+
+    def cell_index(self, coord):
+        """
+        Convertit des coordonnées en indice dans les tableaux plats du plateau.
+
+        Args:
+            coord (tuple): Coordonnées (y, x).
+
+        Returns:
+            int: Indice y * BOARD_SIZE + x.
+        """
+        return coord[0] * self.BOARD_SIZE + coord[1]
+
+    def cell_position(self, index):
+        """
+        Convertit un indice des tableaux plats en coordonnées.
+
+        Args:
+            index (int): Indice de la case.
+
+        Returns:
+            tuple: Coordonnées (y, x).
+        """
+        return divmod(index, self.BOARD_SIZE)
+
+    def _compute_stop_table(self):
+        """
+        Calcule une fois pour toutes la case d'arrêt de chaque glissement sans robots.
+
+        Returns:
+            array: Case d'arrêt à l'indice case * 4 + direction (la case elle-même si le
+            robot ne peut pas bouger dans cette direction).
+        """
+        size = self.BOARD_SIZE
+        walls = self.wall_masks
+        center = self.center_mask
+        table = array("B" if size * size <= 256 else "H", [0]) * (size * size * len(self.DIRECTIONS))
+
+        """
+        Pour chaque direction on connaît le mur de passage (on peut entrer dans la case mais on s'y
+        arrête) et le mur bloquant (on s'arrête sur la case d'avant). Par exemple si je vais vers le
+        haut et que la case suivante a un mur en haut, j'y accède mais je m'arrête, si elle a un mur
+        en bas je m'arrête sur la case d'avant.
+        """
+
+        for cell in range(size * size):
+            y, x = self.cell_position(cell)
+            for d, (_, passing_wall, blocking_wall, dy, dx) in enumerate(self.DIRECTIONS):
+                last = cell
+                if not walls[cell] & passing_wall:
+                    ny, nx = y + dy, x + dx
+                    while 0 <= ny < size and 0 <= nx < size:
+                        next_cell = ny * size + nx
+                        if walls[next_cell] & blocking_wall or center[next_cell]:
+                            break
+                        last = next_cell
+                        if walls[next_cell] & passing_wall:
+                            break
+                        ny += dy
+                        nx += dx
+                table[cell * 4 + d] = last
+
+        return table
+
+    def layout_key(self):
+        """
+        Renvoie une empreinte de la disposition des murs (taille, murs et centre), qui identifie
+        les données calculées une fois par plateau et gardées d'une exécution à l'autre.
+
+        Returns:
+            str: Empreinte hexadécimale.
+        """
+        digest = hashlib.sha1(bytes([self.BOARD_SIZE]))
+        digest.update(self.wall_masks)
+        digest.update(self.center_mask)
+        return digest.hexdigest()
+
+    def distance_map(self, target_cell):
+        """
+        Calcule (une fois par cible) le nombre minimal de glissements pour qu'un robot seul
+        atteigne la case cible depuis chaque case. Les autres robots sont ignorés comme murs,
+        mais comme ils peuvent arrêter un robot n'importe où, un glissement peut ici se terminer
+        sur n'importe quelle case avant le mur. La distance ne surestime donc jamais le nombre de
+        déplacements du robot de la cible, ce qui en fait une heuristique admissible pour A*.
+
+        Args:
+            target_cell (int): Indice de la case cible.
+
+        Returns:
+            bytearray: Distance pour chaque case (UNREACHABLE si la cible est inaccessible).
+        """
+        if target_cell in self.distance_maps:
+            return self.distance_maps[target_cell]
+        self._collect_precomputed()
+        if target_cell in self.distance_maps:
+            return self.distance_maps[target_cell]
+
+        size = self.BOARD_SIZE
+        distances = bytearray([self.UNREACHABLE]) * (size * size)
+        distances[target_cell] = 0
+        queue = collections.deque([target_cell])
+
+        # BFS inverse : les prédécesseurs d'une case sont les cases de ses rayons jusqu'au mur
+        # (les murs bloquent dans les deux sens, et on ne peut jamais s'arrêter au centre)
+        while queue:
+            cell = queue.popleft()
+            if self.center_mask[cell]:
+                continue
+            distance = distances[cell] + 1
+            for d, (_, _, _, dy, dx) in enumerate(self.DIRECTIONS):
+                step = dy * size + dx
+                cell_on_ray = self.stop_table[cell * 4 + d]
+                while cell_on_ray != cell:
+                    if distances[cell_on_ray] == self.UNREACHABLE:
+                        distances[cell_on_ray] = distance
+                        queue.append(cell_on_ray)
+                    cell_on_ray -= step
+
+        # Un robot ne peut pas s'arrêter au centre, mais il peut y avoir été placé au départ : on
+        # lui donne la distance de la meilleure case de ses rayons, plus le glissement pour en sortir
+        for cell in range(size * size):
+            if self.center_mask[cell] and cell != target_cell:
+                for d, (_, _, _, dy, dx) in enumerate(self.DIRECTIONS):
+                    step = dy * size + dx
+                    cell_on_ray = self.stop_table[cell * 4 + d]
+                    while cell_on_ray != cell:
+                        distances[cell] = min(distances[cell], distances[cell_on_ray] + 1)
+                        cell_on_ray -= step
+
+        self.distance_maps[target_cell] = distances
+        return distances
+
+    def _collect_precomputed(self):
+        """
+        Récupère, sans attendre, les cartes de distance déjà envoyées par le calcul en
+        arrière-plan.
+        """
+        if self._precomputation is None:
+            return
+        connection, process = self._precomputation
+        try:
+            while connection.poll():
+                for cell, distances in connection.recv().items():
+                    self.distance_maps.setdefault(cell, bytearray(distances))
+        except EOFError:
+            # Le calcul est terminé
+            connection.close()
+            process.join()
+            self._precomputation = None
+
+    def occupancy(self, cells):
+        """
+        Construit l'index d'occupation d'un ensemble de robots : un masque de bits par ligne et
+        un par colonne, mis bout à bout dans deux entiers. La ligne y correspond aux bits
+        y * BOARD_SIZE à y * BOARD_SIZE + BOARD_SIZE - 1 de rows (bit x), la colonne x aux bits
+        x * BOARD_SIZE à x * BOARD_SIZE + BOARD_SIZE - 1 de cols (bit y).
+
+        Args:
+            cells (iterable): Indices des cases occupées.
+
+        Returns:
+            tuple: (rows, cols).
+        """
+        size = self.BOARD_SIZE
+        rows = cols = 0
+        for cell in cells:
+            y, x = divmod(cell, size)
+            rows |= 1 << cell
+            cols |= 1 << (x * size + y)
+        return rows, cols
+
+    def slide(self, cell, direction, occupancy):
+        """
+        Calcule la case d'arrêt d'un robot en tenant compte des murs et des autres robots.
+        Le robot le plus proche sur le chemin est trouvé directement dans l'index d'occupation.
+
+        Args:
+            cell (int): Indice de la case de départ.
+            direction (int): Indice de la direction dans DIRECTIONS.
+            occupancy (tuple): Index d'occupation renvoyé par occupancy().
+
+        Returns:
+            int: Indice de la case d'arrêt (la case de départ si le robot ne peut pas bouger).
+        """
+        stop = self.stop_table[cell * 4 + direction]
+        if stop == cell:
+            return cell
+
+        size = self.BOARD_SIZE
+        rows, cols = occupancy
+        y, x = divmod(cell, size)
+
+        if direction == 0:  # up : lignes stop_y..y-1 de la colonne x
+            stop_y = stop // size
+            segment = (cols >> (x * size + stop_y)) & ((1 << (y - stop_y)) - 1)
+            if segment:
+                return (stop_y + segment.bit_length()) * size + x
+        elif direction == 1:  # down : lignes y+1..stop_y de la colonne x
+            segment = (cols >> (x * size + y + 1)) & ((1 << (stop // size - y)) - 1)
+            if segment:
+                return (y + (segment & -segment).bit_length() - 1) * size + x
+        elif direction == 2:  # left : colonnes stop_x..x-1 de la ligne y
+            segment = (rows >> stop) & ((1 << (cell - stop)) - 1)
+            if segment:
+                return stop + segment.bit_length()
+        else:  # right : colonnes x+1..stop_x de la ligne y
+            segment = (rows >> (cell + 1)) & ((1 << (stop - cell)) - 1)
+            if segment:
+                return cell + (segment & -segment).bit_length() - 1
+        return stop
+
     def get_current_target(self):
         """
         Renvoie la cible actuelle à atteindre.
@@ -162,58 +446,19 @@ class Board:
         else :
             all_robots = self.robots
 
-        y, x= coord
+        # Index d'occupation des robots, construit une seule fois pour tout l'appel
+        occupancy = self.occupancy(self.cell_index(r["position"]) for r in all_robots)
+        cell = self.cell_index(coord)
 
         # On initialise notre dictionnaire de retour avec toutes les directions possibles
         possibleMoves = {"up": None, "down": None, "left": None, "right": None}
 
-        current_wall = self.board[y][x]["walls"]
-
-        """
-        Ce tableau est important puisque grâce à luion peut savoir dans chaque direction 
-        si quelle type de mur est bloquant, et lequel donne accès à la case (comme dit dans 
-        le rapport si je vient d'en bas vers le haut, et que je rencontre un mur qui bloque le haut
-        d'une case je peux accéder à cette case, mais si il bloque le bas je m'arrête sur celle avant
-        """
-        directions = {
-            "up": (self.WALL_TOP, self.WALL_BOTTOM, y - 1, -1, -1, "vertical"),
-            "down": (self.WALL_BOTTOM, self.WALL_TOP, y + 1, len(self.board), 1, "vertical"),
-            "left": (self.WALL_LEFT, self.WALL_RIGHT, x - 1, -1, -1, "horizontal"),
-            "right": (self.WALL_RIGHT, self.WALL_LEFT, x + 1, len(self.board), 1, "horizontal"),
-        }
-
-        for direction, (passing_wall, blocking_wall, start, stop, step, axis) in directions.items():
-            if passing_wall not in current_wall:  # On s'assure qu'on puisse bouger de base
-                last_position = (y, x)  # On réinitialiser la dernière position
-                for i in range(start, stop, step):
-                    # On calcul la prochaine position en fonction de la direction h/v
-                    if axis == "vertical":
-                        next_cell = self.board[i][x]
-                        next_position = (i, x)
-                    else:
-                        next_cell = self.board[y][i]
-                        next_position = (y, i)
-
-                    # On vérifie si dans la prochaine case un obstacle nous empêche d'y accéder
-                    # et donc on doit s'arrête à la case d'avant
-                    if (
-                            blocking_wall in next_cell["walls"] or
-                            "M" in next_cell["type"] or
-                            self.isCollision(next_position, all_robots)
-                    ):
-                        break  # Dans ce cas la on arrête le mouvement dans cette direction
-
-                    # Si il y'a un mur mais on peut quand même accéder à la case, on s'arrête à cette case
-                    if passing_wall in next_cell["walls"]:
-                        last_position = next_position
-                        break
-
-                    # On met à jour la dernière position avec la nouvelle position valide
-                    last_position = next_position
-
-                # Si notre position est différent de la position initiale on l'affecte(dernière verif)
-                if last_position != (y,x):
-                    possibleMoves[direction] = last_position
+        for d, (direction, _, _, _, _) in enumerate(self.DIRECTIONS):
+            stop = self.slide(cell, d, occupancy)
+
+            # Si notre position est différente de la position initiale on l'affecte
+            if stop != cell:
+                possibleMoves[direction] = self.cell_position(stop)
 
         return possibleMoves
 
@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_memory():
+    """
+    Renvoie la mémoire résidente actuelle du processus.
+
+    Returns:
+        int: Taille en octets, ou None si elle ne peut pas être mesurée sur ce système.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    # À défaut, le maximum atteint (en kilo-octets sous Linux, en octets sous macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SearchBudget:
+    """
+    Limites d'une recherche d'IA : durée, nombre d'états développés et mémoire du processus.
+    Chaque limite est optionnelle. Voir Player.solve, qui arrête la recherche avec le résultat
+    "BUDGET_EXCEEDED" dès qu'une limite est dépassée.
+    """
+
+    # La mémoire est relativement coûteuse à mesurer : on ne la vérifie que de temps en temps
+    MEMORY_CHECK_INTERVAL = 0.1
+
+    def __init__(self, time_limit=None, node_limit=None, memory_limit=None):
+        """
+        Args:
+            time_limit (float, optional): Durée maximale en secondes.
+            node_limit (int, optional): Nombre maximal d'états développés.
+            memory_limit (int, optional): Mémoire résidente maximale du processus, en octets.
+        """
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.memory_limit = memory_limit
+        self.start()
+
+    def start(self):
+        """
+        Remet le chronomètre à zéro au début d'une recherche.
+        """
+        self.start_time = time.monotonic()
+        self.next_memory_check = self.start_time
+        self.memory = None
+
+    def elapsed(self):
+        """
+        Returns:
+            float: Secondes écoulées depuis le début de la recherche.
+        """
+        return time.monotonic() - self.start_time
+
+    def exceeded(self, nodes):
+        """
+        Vérifie les limites.
+
+        Args:
+            nodes (int): Nombre d'états développés jusqu'ici.
+
+        Returns:
+            str: La limite dépassée ("time", "nodes" ou "memory"), ou None.
+        """
+        if self.node_limit is not None and nodes >= self.node_limit:
+            return "nodes"
+
+        now = time.monotonic()
+        if self.time_limit is not None and now - self.start_time >= self.time_limit:
+            return "time"
+
+        if self.memory_limit is not None and now >= self.next_memory_check:
+            self.next_memory_check = now + self.MEMORY_CHECK_INTERVAL
+            self.memory = current_memory()
+            if self.memory is not None and self.memory >= self.memory_limit:
+                return "memory"
+        return None
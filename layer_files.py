@@ -0,0 +1,126 @@
+import os
+from array import array
+
+# Nombre d'états lus ou écrits d'un coup (8 octets par état)
+CHUNK_STATES = 1 << 16
+
+
+class LayerWriter:
+    """
+    Écrit une suite d'états compactés dans un fichier binaire (array('Q') mis bout à bout).
+    Le fichier est écrit sous un nom temporaire puis renommé à la fermeture : un fichier de
+    couche présent sur le disque est donc toujours complet, même si le programme a été tué.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Chemin du fichier à écrire.
+        """
+        self.path = path
+        self.file = open(path + ".tmp", "wb")
+        self.buffer = array("Q")
+        self.count = 0
+
+    def append(self, state):
+        """
+        Ajoute un état à la fin du fichier.
+
+        Args:
+            state (int): L'état compacté.
+        """
+        self.buffer.append(state)
+        self.count += 1
+        if len(self.buffer) >= CHUNK_STATES:
+            self.buffer.tofile(self.file)
+            self.buffer = array("Q")
+
+    def close(self):
+        """
+        Termine l'écriture et rend le fichier visible sous son nom définitif.
+        """
+        self.buffer.tofile(self.file)
+        self.file.close()
+        os.replace(self.path + ".tmp", self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+
+
+def write_run(path, states):
+    """
+    Trie un paquet d'états, retire les doublons et l'écrit dans un fichier.
+
+    Args:
+        path (str): Chemin du fichier à écrire.
+        states (array): Les états compactés.
+    """
+    with LayerWriter(path) as writer:
+        for state in unique(sorted(states)):
+            writer.append(state)
+
+
+def read_layer(path):
+    """
+    Relit un fichier d'états par blocs, sans le charger entièrement en mémoire.
+
+    Args:
+        path (str): Chemin du fichier.
+
+    Yields:
+        int: Les états dans l'ordre du fichier.
+    """
+    with open(path, "rb") as file:
+        while True:
+            buffer = array("Q")
+            try:
+                buffer.fromfile(file, CHUNK_STATES)
+            except EOFError:
+                pass  # Le dernier bloc est incomplet, mais les états lus sont bien dans buffer
+            if not buffer:
+                return
+            yield from buffer
+
+
+def unique(sorted_states):
+    """
+    Retire les doublons d'une suite triée.
+
+    Args:
+        sorted_states (iterable): États triés.
+
+    Yields:
+        int: Chaque état une seule fois.
+    """
+    previous = None
+    for state in sorted_states:
+        if state != previous:
+            yield state
+            previous = state
+
+
+def difference(sorted_states, sorted_excluded):
+    """
+    Retire d'une suite triée les états présents dans une autre suite triée (fusion en un seul
+    passage des deux flux).
+
+    Args:
+        sorted_states (iterable): États triés.
+        sorted_excluded (iterable): États triés à retirer.
+
+    Yields:
+        int: Les états de sorted_states absents de sorted_excluded.
+    """
+    excluded = iter(sorted_excluded)
+    current = next(excluded, None)
+    for state in sorted_states:
+        while current is not None and current < state:
+            current = next(excluded, None)
+        if current != state:
+            yield state
@@ -1,9 +1,15 @@
 from game_window import GameWindow
 from board import Board
+from budget import SearchBudget
 from configurations import configurations
-from player import HumanPlayer, AStartPlayer, BFSPlayer
+from player import HumanPlayer, AStartPlayer, BFSPlayer, IDAStarPlayer
+from portfolio import PortfolioPlayer
+from mcts import MCTSPlayer
+from solver_cache import SolverCache
+from speculation import Speculation
 from menu_window import MenuWindow
 import pygame
+import copy
 import time
 import random
 
@@ -15,6 +21,12 @@ HEIGHT = 776
 MARGIN_X = (WIDTH - BOARD_SIZE * CELL_SIZE) // 6
 MARGIN_Y = (HEIGHT - BOARD_SIZE * CELL_SIZE) // 2
 
+# Temps de réflexion maximal d'une IA pour une cible, en secondes (au-delà elle abandonne)
+AI_TIME_LIMIT = 120
+
+# Poids de l'heuristique pour l'A* à tout moment : première solution au plus 2 fois trop longue
+ANYTIME_EPSILON = 2
+
 
 def generate_game_board(board_size=16, num_robots=4, num_targets=4):
     """
@@ -72,6 +84,55 @@ def generate_game_board(board_size=16, num_robots=4, num_targets=4):
 
     return configuration
 
+def create_ai_player(ai_type, name, in_process=False):
+    """
+    Crée le joueur IA correspondant au type choisi dans le menu.
+
+    Args:
+        ai_type (str): Type d'IA renvoyé par MenuWindow.select_ai.
+        name (str): Nom du joueur.
+        in_process (bool): Si True, le joueur ne lance pas de processus de calcul (il est
+            lui-même exécuté dans un processus démon, voir Speculation).
+
+    Returns:
+        Player: Le joueur IA.
+    """
+    budget = SearchBudget(time_limit=AI_TIME_LIMIT)
+    if ai_type == "BFS":
+        player = BFSPlayer(name, budget=budget)
+    elif ai_type == "A*":
+        player = AStartPlayer(name, budget=budget)
+    elif ai_type == "A*_OPTIMAL":
+        player = AStartPlayer(name, optimal=True, budget=budget)
+    elif ai_type == "A*_ANYTIME":
+        player = AStartPlayer(name, epsilon=ANYTIME_EPSILON, budget=budget)
+    elif ai_type == "IDA*":
+        player = IDAStarPlayer(name, budget=budget)
+    elif ai_type == "PORTFOLIO":
+        player = PortfolioPlayer(name, in_process=in_process, budget=budget)
+    elif ai_type == "MCTS":
+        player = MCTSPlayer(name, workers=0 if in_process else None, budget=budget)
+    else:
+        raise ValueError(f"Type d'IA inconnu : {ai_type}")
+    player.engine = ai_type
+    return player
+
+def end_configuration(robots, moves):
+    """
+    Calcule la configuration des robots après une suite de mouvements, sans les jouer.
+
+    Args:
+        robots (list): Configuration de départ.
+        moves (list): Mouvements (couleur, direction, position).
+
+    Returns:
+        list: Configuration d'arrivée.
+    """
+    robots = copy.deepcopy(robots)
+    for color, _, position in moves:
+        next(robot for robot in robots if robot["color"] == color)["position"] = position
+    return robots
+
 def main():
     pygame.init()
 
@@ -107,10 +168,7 @@ def main():
             elif game_mode == "HUMAN_VS_AI":
                 # Mode humain contre IA avec sélection du type d'IA
                 ai_type = menu.select_ai("Choisissez l'IA pour le mode Humain vs IA")
-                if ai_type == "BFS":
-                    players = [HumanPlayer("Player 1"), BFSPlayer(ai_type)]
-                elif ai_type == "A*":
-                    players = [HumanPlayer("Player 1"), AStartPlayer(ai_type)]
+                players = [HumanPlayer("Player 1"), create_ai_player(ai_type, ai_type)]
                 state = "TARGET_SELECTION"
 
             elif game_mode == "AI_VS_AI":
@@ -118,16 +176,8 @@ def main():
                 ai_type_1 = menu.select_ai("Choisissez la première IA pour le mode IA vs IA")
                 ai_type_2 = menu.select_ai("Choisissez la deuxième IA pour le mode IA vs IA")
 
-                if ai_type_1 == "BFS":
-                    player1 = BFSPlayer(ai_type_1 + " 1")
-                elif ai_type_1 == "A*":
-                    player1 = AStartPlayer(ai_type_1 + " 1")
-
-
-                if ai_type_2 == "BFS":
-                    player2 = BFSPlayer(ai_type_2 + " 2")
-                elif ai_type_2 == "A*":
-                    player2 = AStartPlayer(ai_type_2 + " 2")
+                player1 = create_ai_player(ai_type_1, ai_type_1 + " 1")
+                player2 = create_ai_player(ai_type_2, ai_type_2 + " 2")
 
                 players = [player1, player2]
                 state = "TARGET_SELECTION"
@@ -140,7 +190,9 @@ def main():
 
     # On initialise le jeu
     board_config = configuration
-    board = Board(board_config, BOARD_SIZE)
+    ai_engines = {player.engine for player in players if player.engine}
+    # Les tables calculées en arrière-plan ne servent qu'aux IA (personne ne les lirait sinon)
+    board = Board(board_config, BOARD_SIZE, precompute=bool(ai_engines))
     game_window = GameWindow(WIDTH, HEIGHT, CELL_SIZE, MARGIN_Y, MARGIN_X)
 
     for player in players:
@@ -151,6 +203,12 @@ def main():
     # On met des générateurs avec l'utilisation de yield afin de permettre au programme de ne pas freeze
     ai_generator = None
 
+    # Solutions déjà calculées (pendant cette partie ou les précédentes), partagées par les IA
+    solver_cache = SolverCache()
+
+    # Les IA cherchent la cible suivante pendant que le tour se joue (voir Speculation)
+    speculation = Speculation(create_ai_player)
+
     print(board.get_current_target())
 
     while game_window.running:
@@ -159,6 +217,15 @@ def main():
             if event.type == pygame.QUIT:
                 game_window.running = False
 
+                # On arrête proprement la recherche de l'IA en cours (processus de calcul, fichiers...)
+                if ai_generator:
+                    players[current_player_index].cancel()
+                    for _ in ai_generator:
+                        pass
+                    ai_generator = None
+        if not game_window.running:
+            break
+
         current_player = players[current_player_index]
 
         # Le cas ou le joueur est de type humain (on a besoin de paramètre pour l'interface graphique)
@@ -168,7 +235,15 @@ def main():
             # Dans le cas ou c'est une IA
             if not ai_generator:
                 start_time = time.time()  # On prend le temps pour les comparer
-                ai_generator = current_player.play()  # Appel de la méthode de lancement d'IA
+
+                # Le second joueur du tour ne gagne qu'avec strictement moins de coups que le premier
+                # (égalité pour le premier) : inutile de chercher des solutions plus longues
+                previous_player = players[current_player_index - 1]
+                if previous_player.turn > current_player.turn and not previous_player.gave_up:
+                    current_player.max_length = len(previous_player.moves) - 1
+                else:
+                    current_player.max_length = None
+                ai_generator = speculation.solve(current_player, current_player.engine, solver_cache)  # Appel de la méthode de lancement d'IA
             try:
                 ai_result = next(ai_generator)
                 # Plusieurs états sont disponibles pour voir l'avancée de l'IA
@@ -185,6 +260,12 @@ def main():
                     # Réinitialise le générateur
                     ai_generator = None
 
+                    # La configuration de fin de l'IA est connue avant l'animation : on commence
+                    # déjà à chercher la cible suivante depuis celle-ci
+                    if board.current_target_index + 1 < num_targets:
+                        speculation.start(board, end_configuration(board.robots, current_player.moves),
+                                          board.current_target_index + 1, ai_engines)
+
                     #On exécute les mouvements de l'IA mais on s'assure que l'utilisateur peut quitter si
                     # il le souhaite
                     for move in current_player.moves:
@@ -198,6 +279,13 @@ def main():
                         game_window.update_display(board, current_player)
                         time.sleep(3) # On met une pause parceque l'IA est trop rapide
                     move_result = "SOLVED"
+                elif ai_result in ("NO_SOLUTION", "BUDGET_EXCEEDED", "CANNOT_BEAT"):
+                    # L'IA abandonne la cible : elle perd le tour
+                    print(f"AI gave up on the target ({ai_result}).")
+                    ai_generator = None
+                    current_player.moves = []
+                    current_player.gave_up = True
+                    move_result = "GAVE_UP"
                 else:
                     move_result = None
             # Dans le cas ou l'IA n'a pas trouvé de solution
@@ -207,12 +295,15 @@ def main():
         # Dans le cas on le joueur reset, on reinitialise ses coups
         if move_result == "RESET":
             board.resetToInitialConfig()
-        elif move_result == "SOLVED":
+        elif move_result in ("SOLVED", "GAVE_UP"):
             # Si un joueur atteint la cible
             if isinstance(current_player, HumanPlayer):
                 # On met une petite pause pour voir le mouvement
                 game_window.update_display(board, current_player)
                 time.sleep(0.1)
+
+                if move_result == "SOLVED" and board.current_target_index + 1 < num_targets:
+                    speculation.start(board, board.getRobotPosition(), board.current_target_index + 1, ai_engines)
             players[current_player_index].increment_turn()
 
             # Passe au joueur suivant
@@ -226,9 +317,15 @@ def main():
                 winner = players[current_player_index] if len(players[current_player_index].moves) <= len(
                     players[ex_index].moves) else players[ex_index]
 
+                # Un joueur qui a abandonné perd le tour (personne ne gagne si les deux ont abandonné)
+                if winner.gave_up:
+                    other = players[ex_index] if winner is players[current_player_index] else players[current_player_index]
+                    winner = other if not other.gave_up else None
+
                 # Passe à la cible suivante
-                winner.score += 1 # Incrémente le score du gagnant
-                game_window.show_popup(winner.name, len(winner.moves))
+                if winner:
+                    winner.score += 1 # Incrémente le score du gagnant
+                    game_window.show_popup(winner.name, len(winner.moves))
 
                 board.advance_to_next_target()
 
@@ -242,12 +339,15 @@ def main():
                 players[current_player_index].resetMoves()
 
                 # On prend la configuration du gagnant
-                winner_configuration = winner.board.getRobotPosition()
+                winner_configuration = board.getRobotPosition()
 
                 # On s'assure que tous les joueurs on la même configuration
                 for p in players:
                     p.board.setNewConfig(winner_configuration)
 
+                # On garde les recherches spéculatives parties de cette configuration
+                speculation.resolve(board, ai_engines, solver_cache)
+
                 game_window.update_display(board, players[current_player_index])
             else:
                 board.resetToInitialConfig()
@@ -0,0 +1,329 @@
+import math
+import multiprocessing
+import os
+import random
+
+from player import Player
+from shared_board import SharedBoard, SharedBoardTables
+
+# Probabilité qu'un déplacement de simulation rapproche au mieux le robot de la cible (d'après
+# la carte de distance) plutôt que d'être tiré au hasard
+GREEDY_ROLLOUT = 0.5
+
+# Contexte d'un processus de simulation : (joueur préparé pour la cible, carte de distance)
+_rollout_context = None
+
+
+def _init_rollout_worker(tables, robots, targets, target_index):
+    """
+    Prépare un processus du groupe de simulation : le plateau est lu dans la mémoire partagée
+    et un joueur sert à générer les déplacements.
+
+    Args:
+        tables (tuple): SharedBoardTables.handle des tableaux du plateau.
+        robots (list): Robots du plateau.
+        targets (list): Cibles du plateau.
+        target_index (int): Indice de la cible actuelle.
+    """
+    global _rollout_context
+    random.seed()  # Les processus copiés du parent auraient sinon tous la même suite aléatoire
+    board = SharedBoard.attach(tables, robots, targets, target_index)
+    solver = Player("rollout")
+    solver.set_board(board)
+    solver._start_search()
+    _rollout_context = (solver, board.distance_map(solver._target_cell))
+
+
+def _solution_reward(length, horizon):
+    """
+    Récompense d'une simulation qui atteint la cible : entre 0.5 et 1, d'autant plus grande
+    que la solution est courte.
+
+    Args:
+        length (int): Longueur de la solution.
+        horizon (int): Longueur maximale d'une solution.
+
+    Returns:
+        float: La récompense.
+    """
+    return 1 - 0.5 * length / horizon
+
+
+def _rollout(job):
+    """
+    Simulation dans un processus du groupe (voir _simulate).
+    """
+    solver, distances = _rollout_context
+    return _simulate(solver, distances, job)
+
+
+def _simulate(solver, distances, job):
+    """
+    Simulation depuis une feuille de l'arbre : des déplacements sont joués (au hasard ou vers la
+    cible) jusqu'à atteindre la cible ou la longueur maximale.
+
+    Args:
+        solver (Player): Joueur préparé pour la cible (voir Player._start_search).
+        distances (bytearray): Carte de distance de la cible.
+        job (tuple): (état, dernier déplacement, profondeur de la feuille, longueur maximale
+            d'une solution, horizon des récompenses).
+
+    Returns:
+        tuple: (récompense, déplacements de la simulation si elle atteint la cible, sinon None).
+    """
+    state, last_move, depth, max_length, horizon = job
+    cell_mask = solver._cell_mask
+    closest = distances[state & cell_mask]
+    path = []
+
+    while depth + len(path) < max_length:
+        successors = list(solver._pruned_successors(state, last_move))
+        if not successors:
+            break
+        if random.random() < GREEDY_ROLLOUT:
+            random.shuffle(successors)  # Égalités départagées au hasard
+            move = min(successors, key=lambda successor: distances[successor[3] & cell_mask])
+        else:
+            move = random.choice(successors)
+        last_move, state = move[:3], move[3]
+        path.append(last_move)
+        if solver._is_goal(state):
+            return _solution_reward(depth + len(path), horizon), path
+        closest = min(closest, distances[state & cell_mask])
+
+    # Cible non atteinte : récompense inférieure à 0.5, selon la distance la plus proche atteinte
+    return 0.5 / (1 + closest), None
+
+
+class _Node:
+    """
+    Nœud de l'arbre de recherche : un état et les statistiques des simulations qui y sont passées.
+    """
+
+    __slots__ = ("state", "parent", "move", "depth", "h", "children", "visits", "value", "dead")
+
+    def __init__(self, state, parent, move, depth, h):
+        self.state = state
+        self.parent = parent
+        self.move = move  # Déplacement (case de départ, direction, case d'arrivée) depuis le parent
+        self.depth = depth
+        self.h = h  # Distance du robot de la cible dans la carte de distance (0 : but)
+        self.children = None  # Créés à la première visite
+        self.visits = 0
+        self.value = 0.0  # Somme des récompenses
+        self.dead = False  # Aucune solution plus courte que la limite ne passe par ce nœud
+
+
+class MCTSPlayer(Player):
+    def __init__(self, name, rollouts=20000, batch_size=32, horizon=30, exploration=0.4, workers=None,
+                 budget=None):
+        """
+        Initialise un joueur utilisant la recherche arborescente Monte-Carlo (UCT) : l'arbre
+        des déplacements est développé vers les branches les plus prometteuses d'après des
+        simulations jouées jusqu'à la cible. Les simulations sont lancées par lots sur un groupe
+        de processus. La solution n'est pas forcément optimale mais une réponse arrive vite là
+        où la recherche exhaustive est trop lente.
+
+        Args:
+            name (str): Nom du joueur.
+            rollouts (int): Nombre maximal de simulations.
+            batch_size (int): Nombre de simulations lancées ensemble sur le groupe de processus.
+            horizon (int): Longueur maximale d'une solution.
+            exploration (float): Constante d'exploration de UCT.
+            workers (int, optional): Nombre de processus, par défaut le nombre de cœurs. 0 pour
+                simuler dans le processus courant (par exemple dans un processus démon, qui ne
+                peut pas en lancer d'autres).
+            budget (SearchBudget, optional): Limites de la recherche (voir Player.solve).
+        """
+        super().__init__(name)
+        self.rollouts = rollouts
+        self.batch_size = batch_size
+        self.horizon = horizon
+        self.exploration = exploration
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.budget = budget
+
+    def _expand(self, node, distances):
+        """
+        Crée les enfants d'un nœud, un par déplacement utile.
+
+        Args:
+            node (_Node): Le nœud.
+            distances (bytearray): Carte de distance de la cible.
+        """
+        unreachable = self.board.UNREACHABLE
+        node.children = []
+        for cell, direction, new_cell, new_state in self._pruned_successors(node.state, node.move):
+            h = distances[new_state & self._cell_mask]
+            if h != unreachable:
+                node.children.append(_Node(new_state, node, (cell, direction, new_cell), node.depth + 1, h))
+
+    def _select(self, root, limit, distances):
+        """
+        Descend dans l'arbre avec UCT jusqu'à un nœud à simuler. Les visites sont comptées dès
+        la sélection (perte virtuelle) : les autres sélections du même lot partent ailleurs.
+
+        Args:
+            root (_Node): La racine.
+            limit (int): Longueur à battre : les nœuds qui ne peuvent pas mener à une solution
+                plus courte sont écartés.
+            distances (bytearray): Carte de distance de la cible.
+
+        Returns:
+            _Node: Le nœud sélectionné (un but, un nœud sans issue ou un nouveau nœud).
+        """
+        node = root
+        node.visits += 1
+        while node.h:
+            if node.children is None:
+                self._expand(node, distances)
+            viable = [child for child in node.children if not child.dead and child.depth + child.h < limit]
+            if not viable:
+                node.dead = True
+                break
+
+            unvisited = [child for child in viable if child.visits == 0]
+            if unvisited:
+                # Nouveau nœud : il est simulé
+                node = random.choice(unvisited)
+                node.visits += 1
+                break
+            log_visits = math.log(node.visits)
+            node = max(viable, key=lambda child: child.value / child.visits
+                       + self.exploration * math.sqrt(log_visits / child.visits))
+            node.visits += 1
+        return node
+
+    def _tree_path(self, node):
+        """
+        Args:
+            node (_Node): Un nœud de l'arbre.
+
+        Returns:
+            list: Déplacements (case de départ, direction, case d'arrivée) depuis la racine.
+        """
+        path = []
+        while node.parent is not None:
+            path.append(node.move)
+            node = node.parent
+        path.reverse()
+        return path
+
+    def play(self):
+        """
+        Exécute la recherche Monte-Carlo jusqu'à épuiser le nombre de simulations.
+
+        Yields:
+            str: "CALCULATING" lorsque les simulations sont en cours.
+            str: "IMPROVED" à chaque solution plus courte (dans self.best_moves).
+            str: "SOLVED" avec la meilleure solution trouvée à la fin des simulations.
+            str: "NO_SOLUTION" si la cible est inaccessible.
+            str: "CANNOT_BEAT" si l'arbre complet prouve qu'aucune solution n'a au plus
+            self.max_length coups.
+            str: "BUDGET_EXCEEDED" si les simulations sont épuisées sans solution.
+        """
+        self.best_moves = None
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+        if self._is_goal(start_state):
+            self.moves = []
+            yield "SOLVED"
+            return
+
+        distances = self.board.distance_map(self._target_cell)
+        root = _Node(start_state, None, None, 0, distances[start_state & self._cell_mask])
+        self.lower_bound = root.h
+        max_length = self.horizon if self.max_length is None else min(self.horizon, self.max_length)
+        limit = max_length + 1  # Les solutions gardées sont strictement plus courtes
+        done = 0
+
+        tables = pool = None
+        if self.workers:
+            tables = SharedBoardTables(self.board)
+            pool = multiprocessing.Pool(
+                self.workers, initializer=_init_rollout_worker,
+                initargs=(tables.handle, self.board.robots, self.board.targets, self.board.current_target_index),
+            )
+        try:
+            # La borne de la carte de distance est atteinte : aucune solution ne peut être plus courte
+            while done < self.rollouts and not root.dead and limit > root.h:
+                yield "CALCULATING"
+
+                # Sélection d'un lot de feuilles, les simulations sont faites par le groupe
+                selected = []
+                jobs = []
+                for _ in range(min(self.batch_size, self.rollouts - done)):
+                    node = self._select(root, limit, distances)
+                    if node is root:
+                        break  # Arbre épuisé
+                    # Un nœud peut être déclaré sans issue par une sélection suivante du même lot :
+                    # on retient dès maintenant s'il a une simulation
+                    simulated = bool(node.h) and not node.dead
+                    selected.append((node, simulated))
+                    if simulated:
+                        jobs.append((node.state, node.move, node.depth, limit - 1, self.horizon))
+
+                if pool is None:
+                    outcomes = iter([_simulate(self, distances, job) for job in jobs])
+                else:
+                    pending = pool.map_async(_rollout, jobs)
+                    while not pending.ready():
+                        yield "CALCULATING"
+                        pending.wait(0.01)
+                    outcomes = iter(pending.get())
+
+                improved = False
+                for node, simulated in selected:
+                    path = None
+                    if simulated:
+                        reward, path = next(outcomes)
+                    elif not node.h:
+                        reward = _solution_reward(node.depth, self.horizon)
+                        path = []
+                    else:
+                        reward = 0.0
+
+                    if path is not None and node.depth + len(path) < limit:
+                        path = self._tree_path(node) + path
+                        limit = len(path)
+                        self.best_moves = self._moves_from_path(path)
+                        self.moves = list(self.best_moves)
+                        improved = True
+
+                    # Rétropropagation (les visites ont été comptées à la sélection)
+                    while node is not None:
+                        node.value += reward
+                        node = node.parent
+
+                done += len(selected)
+                self.nodes_expanded += len(selected)
+                if improved:
+                    print(f"Solution en {limit} coups après {done} simulations")
+                    yield "IMPROVED"
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+                tables.close()
+
+        if self.best_moves is not None:
+            self.moves = list(self.best_moves)
+            print("Solution trouvée avec les mouvements :", self.moves)
+            yield "SOLVED"
+            return
+        if (root.dead or limit <= root.h) and self.max_length is not None and self.max_length <= self.horizon:
+            print(f"Aucune solution en {self.max_length} coups ou moins.")
+            yield "CANNOT_BEAT"
+            return
+
+        self.search_report = {
+            "reason": "rollouts",
+            "elapsed": self.budget.elapsed() if self.budget is not None else None,
+            "nodes": self.nodes_expanded,
+            "memory": None,
+            "lower_bound": self.lower_bound,
+        }
+        print(f"Aucune solution trouvée en {done} simulations.")
+        yield "BUDGET_EXCEEDED"
@@ -248,19 +248,24 @@ class MenuWindow:
             title = self.font.render(prompt, True, (0, 0, 0))
             self.screen.blit(title, (self.width // 2 - title.get_width() // 2, 50))
 
+            # Define button labels and AI types
+            ai_options = [
+                ("Recherche en largeur", "BFS"),
+                ("A*", "A*"),
+                ("A* optimal", "A*_OPTIMAL"),
+                ("A* à tout moment", "A*_ANYTIME"),
+                ("IDA*", "IDA*"),
+                ("Portefeuille (course entre IA)", "PORTFOLIO"),
+                ("Monte-Carlo (MCTS)", "MCTS"),
+            ]
+
             # Define button dimensions and positions
             button_width, button_height = 500, 60
             spacing = 20
-            total_height = 3 * button_height + 2 * spacing  # Total height of all buttons and spaces
+            total_height = len(ai_options) * (button_height + spacing) - spacing  # Total height of all buttons and spaces
             start_y = (self.height // 2 - total_height // 2)  # Starting y-coordinate for the first button
             button_x = (self.width // 2 - button_width // 2)
 
-            # Define button labels and AI types
-            ai_options = [
-                ("Recherche en largeur", "BFS"),
-                ("A*", "A*")
-            ]
-
             # Draw buttons
             mouse_position = pygame.mouse.get_pos()
             buttons = []  # Store button rectangles and associated AI types
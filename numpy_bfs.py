@@ -0,0 +1,275 @@
+import numpy as np
+
+from player import Player
+from visited import BitsetVisited
+
+
+class NumpyBFSPlayer(Player):
+    def __init__(self, name, canonical=False, block_states=1 << 18, budget=None):
+        """
+        Initialise un joueur BFS vectorisé : une couche entière de la recherche est gardée dans
+        un tableau NumPy d'états compactés, et tous les successeurs (tous les robots dans toutes
+        les directions) sont calculés par opérations sur tableaux à partir de la table des arrêts
+        du plateau, au lieu d'un état à la fois en Python. Les états visités sont marqués dans
+        un bitset indexé par l'état (voir BitsetVisited), vu comme un tableau NumPy : chaque
+        couche ne coûte que sa propre taille, quel que soit le nombre d'états déjà vus.
+
+        Args:
+            name (str): Nom du joueur.
+            canonical (bool): Si True, les robots bloqueurs sont considérés interchangeables.
+            block_states (int): Nombre d'états d'une couche traités ensemble, pour borner la
+                mémoire des tableaux intermédiaires.
+            budget (SearchBudget, optional): Limites de la recherche (voir Player.solve).
+        """
+        super().__init__(name)
+        self.exact = True
+        self.canonical = canonical
+        self.block_states = block_states
+        self.budget = budget
+
+    def _slides(self, cells, lines, robot, direction):
+        """
+        Calcule la case d'arrêt d'un robot dans une direction pour tout un bloc d'états.
+
+        Args:
+            cells (ndarray): Cases des robots, une colonne par robot.
+            lines (tuple): (lignes, colonnes) des robots, mêmes dimensions que cells.
+            robot (int): Indice du robot qui se déplace.
+            direction (int): Indice de la direction.
+
+        Returns:
+            ndarray: Case d'arrêt pour chaque état.
+        """
+        step = self._steps[direction]
+        cell = cells[:, robot]
+        # Un déplacement vertical reste dans la colonne du robot, un horizontal dans sa ligne
+        line = lines[1] if direction < 2 else lines[0]
+
+        # Arrêt dû aux murs seulement, puis on le raccourcit avec chaque autre robot sur le chemin
+        stop = self._stop_table[cell * 4 + direction]
+        for other in range(cells.shape[1]):
+            if other == robot:
+                continue
+            blocker = cells[:, other]
+            if step > 0:
+                on_path = (blocker > cell) & (blocker <= stop)
+            else:
+                on_path = (blocker < cell) & (blocker >= stop)
+            on_path &= line[:, other] == line[:, robot]
+            stop = np.where(on_path, blocker - step, stop)
+        return stop
+
+    def _pack(self, cells):
+        """
+        Compacte des cases de robots (une colonne par robot) en états.
+
+        Args:
+            cells (ndarray): Cases des robots.
+
+        Returns:
+            ndarray: États compactés.
+        """
+        states = np.zeros(cells.shape[0], dtype=np.int64)
+        for i in range(cells.shape[1]):
+            states |= cells[:, i].astype(np.int64) << (self._cell_bits * i)
+        return states
+
+    def _expand(self, states, details=True):
+        """
+        Calcule tous les successeurs d'un bloc d'états.
+
+        Args:
+            states (ndarray): États compactés.
+            details (bool): Si False, seuls les successeurs sont calculés (les autres
+                tableaux ne servent qu'à reconstruire le chemin).
+
+        Returns:
+            tuple: (successeurs, indice de l'état parent, case de départ, direction, case
+            d'arrivée), un tableau par élément, ou (successeurs,) sans les détails.
+        """
+        robots = len(self._colors)
+        size = self.board.BOARD_SIZE
+        # Les cases tiennent sur 32 bits : moins de mémoire à parcourir que les états
+        cells = np.empty((len(states), robots), dtype=np.int32)
+        for i in range(robots):
+            cells[:, i] = (states >> (self._cell_bits * i)) & self._cell_mask
+        lines = (cells // size, cells % size)
+        parents = np.arange(len(states))
+
+        results = []
+        for robot in range(robots):
+            shift = self._cell_bits * robot
+            for direction in range(len(self.board.DIRECTIONS)):
+                stop = self._slides(cells, lines, robot, direction)
+                moved = stop != cells[:, robot]
+                if not moved.any():
+                    continue
+
+                if self.canonical and robot:
+                    new_cells = cells[moved]
+                    new_cells[:, robot] = stop[moved]
+                    new_cells[:, 1:] = np.sort(new_cells[:, 1:], axis=1)
+                    new_states = self._pack(new_cells)
+                else:
+                    # Seule la case du robot déplacé change dans l'état compacté
+                    new_states = (states + ((stop - cells[:, robot]).astype(np.int64) << shift))[moved]
+
+                if details:
+                    results.append((new_states, parents[moved], cells[moved, robot],
+                                    np.full(len(new_states), direction), stop[moved]))
+                else:
+                    results.append((new_states,))
+
+        if not results:
+            empty = np.empty(0, dtype=np.int64)
+            return (empty, empty, empty, empty, empty) if details else (empty,)
+        return tuple(np.concatenate(column) for column in zip(*results))
+
+    def _sorted_unique(self, states):
+        """
+        Trie des états et retire les doublons (plus rapide que np.unique sur de grands tableaux).
+
+        Args:
+            states (ndarray): États compactés.
+
+        Returns:
+            ndarray: Les états triés, sans doublons.
+        """
+        states = np.sort(states)
+        return states[np.concatenate(([True], states[1:] != states[:-1]))]
+
+    def _unvisited(self, bits, states):
+        """
+        Filtre les états déjà marqués dans le bitset.
+
+        Args:
+            bits (ndarray): Le bitset des états visités, un octet pour huit états.
+            states (ndarray): États compactés.
+
+        Returns:
+            ndarray: Les états non visités.
+        """
+        return states[(bits[states >> 3] & (1 << (states & 7)).astype(np.uint8)) == 0]
+
+    def _mark(self, bits, states):
+        """
+        Marque des états dans le bitset.
+
+        Args:
+            bits (ndarray): Le bitset des états visités.
+            states (ndarray): États compactés, triés et sans doublons.
+        """
+        if not len(states):
+            return
+        byte = states >> 3
+        bit = (1 << (states & 7)).astype(np.uint8)
+        # Les états triés d'un même octet se suivent : on réunit leurs bits avant d'écrire
+        starts = np.flatnonzero(np.concatenate(([True], byte[1:] != byte[:-1])))
+        bits[byte[starts]] |= np.bitwise_or.reduceat(bit, starts)
+
+    def _backtrack(self, layers, state):
+        """
+        Reconstruit le chemin vers un état en cherchant, couche par couche en remontant, un
+        parent dont il est un successeur. Chaque couche est développée par blocs vectorisés.
+
+        Args:
+            layers (list): Couches d'états, la dernière contenant l'état.
+            state (int): L'état final.
+
+        Returns:
+            list: Déplacements (case de départ, direction, case d'arrivée) depuis le départ.
+        """
+        path = []
+        for layer in reversed(layers[:-1]):
+            for block_start in range(0, len(layer), self.block_states):
+                block = layer[block_start:block_start + self.block_states]
+                states, parents, cells, directions, new_cells = self._expand(block)
+                hits = np.flatnonzero(states == state)
+                if len(hits):
+                    i = hits[0]
+                    path.append((int(cells[i]), int(directions[i]), int(new_cells[i])))
+                    state = int(block[parents[i]])
+                    break
+        path.reverse()
+        return path
+
+    def play(self):
+        """
+        Exécute la recherche en largeur une couche à la fois.
+
+        Yields:
+            str: "CALCULATING" lorsque l'algorithme est en cours de calcul.
+            str: "SOLVED" si une solution est trouvée.
+            str: "NO_SOLUTION" si aucune solution n'est trouvée.
+            str: "CANNOT_BEAT" si aucune solution n'a au plus self.max_length coups.
+        """
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+        if self._is_goal(start_state):
+            self.moves = []
+            yield "SOLVED"
+            return
+
+        self._stop_table = np.asarray(self.board.stop_table, dtype=np.int32)
+        layers = [np.array([start_state], dtype=np.int64)]
+        visited = BitsetVisited(self._cell_bits * len(self._colors))
+        bits = np.frombuffer(visited.bits, dtype=np.uint8)  # Vue sur le bitset, sans copie
+        self._mark(bits, layers[0])
+        try:
+            yield from self._search_layers(layers, bits)
+        finally:
+            del bits  # La projection ne peut pas être fermée tant qu'une vue existe
+            visited.close()
+
+    def _search_layers(self, layers, bits):
+        """
+        Boucle de la recherche, couche par couche (voir play).
+
+        Args:
+            layers (list): Couches d'états, la première contenant l'état de départ.
+            bits (ndarray): Le bitset des états visités.
+
+        Yields:
+            str: Les résultats de play().
+        """
+        while len(layers[-1]):
+            new_layer = []
+            layer = layers[-1]
+            self.lower_bound = len(layers)
+            if self._cannot_beat(self.lower_bound):
+                print(f"Aucune solution en {self.max_length} coups ou moins.")
+                yield "CANNOT_BEAT"
+                return
+
+            for block_start in range(0, len(layer), self.block_states):
+                yield "CALCULATING"
+                block = layer[block_start:block_start + self.block_states]
+                self.nodes_expanded += len(block)
+                states, = self._expand(block, details=False)
+
+                # Test du but sur tous les successeurs d'un coup
+                if ((states & self._cell_mask) == self._target_cell).any():
+                    # On recalcule le bloc avec les déplacements pour retrouver le parent
+                    states, parents, cells, directions, new_cells = self._expand(block)
+                    i = np.flatnonzero((states & self._cell_mask) == self._target_cell)[0]
+                    path = self._backtrack(layers, int(block[parents[i]]))
+                    path.append((int(cells[i]), int(directions[i]), int(new_cells[i])))
+                    self.moves = self._moves_from_path(path)
+                    print("Solution trouvée avec les mouvements :", self.moves)
+                    yield "SOLVED"
+                    return
+
+                # Les états déjà vus sont écartés par le bitset avant le tri, qui ne coûte que
+                # les nouveaux états
+                new_layer.append(self._sorted_unique(self._unvisited(bits, states)))
+
+            # Dédoublonnage de la nouvelle couche
+            next_layer = self._sorted_unique(np.concatenate(new_layer)) if new_layer else np.empty(0, dtype=np.int64)
+            self._mark(bits, next_layer)
+            layers.append(next_layer)
+            print(f"Couche {len(layers) - 1} : {len(next_layer)} nouveaux états")
+
+        print("Aucune solution trouvée.")
+        yield "NO_SOLUTION"
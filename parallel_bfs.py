@@ -0,0 +1,241 @@
+import multiprocessing
+import os
+from array import array
+
+from player import Player
+from shared_board import SharedBoard, SharedBoardTables
+from visited import mix64
+
+
+def shard_of(state, shards):
+    """
+    Renvoie le numéro du processus propriétaire d'un état (partition par hachage).
+
+    Args:
+        state (int): L'état compacté.
+        shards (int): Nombre de processus.
+
+    Returns:
+        int: Numéro du processus.
+    """
+    return (mix64(state) >> 32) % shards
+
+
+def _shard_worker(connection, tables, robots, targets, target_index, canonical, shards, found):
+    """
+    Boucle d'un processus de la recherche parallèle. Le processus possède la partie de
+    l'ensemble des états visités qui lui revient (avec parent et déplacement de chaque état),
+    développe les états reçus à chaque couche et renvoie leurs successeurs répartis par
+    processus propriétaire, avec le nombre d'états nouveaux réellement développés (les états
+    reçus déjà visités sont écartés).
+
+    Args:
+        connection (Connection): Extrémité du tube vers le coordinateur.
+        tables (tuple): SharedBoardTables.handle des tableaux du plateau.
+        robots (list): Robots du plateau.
+        targets (list): Cibles du plateau.
+        target_index (int): Indice de la cible actuelle.
+        canonical (bool): Mode canonique des robots bloqueurs.
+        shards (int): Nombre de processus.
+        found (Event): Positionné dès qu'un processus trouve la cible, pour arrêter les autres.
+    """
+    # Les tableaux du plateau sont lus directement dans la mémoire partagée
+    board = SharedBoard.attach(tables, robots, targets, target_index)
+    solver = Player("shard")
+    solver.set_board(board)
+    solver.canonical = canonical
+    solver._start_search()
+    parents = {}
+
+    while True:
+        message = connection.recv()
+
+        if message[0] == "expand":
+            _, states, parent_states, moves = message
+            outgoing = [(array("q"), array("q"), array("q")) for _ in range(shards)]
+            goal = None
+            expanded = 0
+
+            for i, state in enumerate(states):
+                if state in parents:
+                    continue
+                parents[state] = (parent_states[i], moves[i])
+                if i % 1024 == 0 and found.is_set():
+                    break  # Un autre processus a trouvé la cible, inutile de continuer
+                expanded += 1
+
+                last_move = solver._unpack_move(moves[i]) if parent_states[i] >= 0 else None
+                for cell, direction, new_cell, new_state in solver._pruned_successors(state, last_move):
+                    move = solver._pack_move((cell, direction, new_cell))
+                    if solver._is_goal(new_state):
+                        found.set()
+                        goal = (new_state, state, move)
+                        break
+                    bucket = outgoing[shard_of(new_state, shards)]
+                    bucket[0].append(new_state)
+                    bucket[1].append(state)
+                    bucket[2].append(move)
+                if goal:
+                    break
+
+            if goal:
+                connection.send(("goal",) + goal + (expanded,))
+            else:
+                connection.send(("layer", outgoing, expanded))
+
+        elif message[0] == "parent":
+            connection.send(parents.get(message[1]))
+
+        else:  # "stop"
+            connection.close()
+            board.close()
+            return
+
+
+class ParallelBFSPlayer(Player):
+    def __init__(self, name, canonical=False, workers=None, budget=None):
+        """
+        Initialise un joueur BFS parallèle : chaque couche de la recherche est répartie par
+        hachage des états entre plusieurs processus, chacun possédant sa partie de l'ensemble
+        des états visités. Entre deux couches, les successeurs sont échangés pour être envoyés
+        à leur processus propriétaire.
+
+        Args:
+            name (str): Nom du joueur.
+            canonical (bool): Si True, les robots bloqueurs sont considérés interchangeables.
+            workers (int, optional): Nombre de processus, par défaut le nombre de cœurs.
+            budget (SearchBudget, optional): Limites de la recherche (voir Player.solve).
+        """
+        super().__init__(name)
+        self.exact = True
+        self.canonical = canonical
+        self.workers = workers or os.cpu_count() or 1
+        self.budget = budget
+
+    def _start_workers(self):
+        self._tables = SharedBoardTables(self.board)
+        self._found = multiprocessing.Event()
+        self._connections = []
+        self._processes = []
+        for _ in range(self.workers):
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_shard_worker,
+                args=(child_end, self._tables.handle, self.board.robots, self.board.targets,
+                      self.board.current_target_index, self.canonical, self.workers, self._found),
+                daemon=True,
+            )
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+
+    def _stop_workers(self):
+        self._found.set()  # Les processus encore en train de développer une couche s'arrêtent
+        for connection in self._connections:
+            try:
+                # On vide le tube : un processus bloqué dans l'envoi de sa couche ne lirait
+                # jamais le message d'arrêt
+                while connection.poll(0.02):
+                    connection.recv()
+                connection.send(("stop",))
+                connection.close()
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self._tables.close()
+
+    def _path_from_shards(self, state, parent, move):
+        """
+        Reconstruit le chemin en demandant à chaque processus propriétaire le parent des états.
+
+        Args:
+            state (int): L'état final.
+            parent (int): Son parent.
+            move (int): Le déplacement compacté qui y mène.
+
+        Returns:
+            list: Déplacements (case de départ, direction, case d'arrivée) depuis le départ.
+        """
+        path = [self._unpack_move(move)]
+        state = parent
+        while True:
+            connection = self._connections[shard_of(state, self.workers)]
+            connection.send(("parent", state))
+            parent, move = connection.recv()
+            if parent < 0:
+                break
+            path.append(self._unpack_move(move))
+            state = parent
+        path.reverse()
+        return path
+
+    def play(self):
+        """
+        Exécute la recherche en largeur parallèle.
+
+        Yields:
+            str: "CALCULATING" lorsque l'algorithme est en cours de calcul.
+            str: "SOLVED" si une solution est trouvée.
+            str: "NO_SOLUTION" si aucune solution n'est trouvée.
+            str: "CANNOT_BEAT" si aucune solution n'a au plus self.max_length coups.
+        """
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+        if self._is_goal(start_state):
+            self.moves = []
+            yield "SOLVED"
+            return
+
+        self._start_workers()
+        try:
+            # Boîtes de réception de chaque processus : (états, parents, déplacements)
+            inboxes = [(array("q"), array("q"), array("q")) for _ in range(self.workers)]
+            inbox = inboxes[shard_of(start_state, self.workers)]
+            inbox[0].append(start_state)
+            inbox[1].append(-1)
+            inbox[2].append(0)
+            self.lower_bound = 0
+
+            while any(len(states) for states, _, _ in inboxes):
+                self.lower_bound += 1
+                if self._cannot_beat(self.lower_bound):
+                    print(f"Aucune solution en {self.max_length} coups ou moins.")
+                    yield "CANNOT_BEAT"
+                    return
+                for connection, (states, parent_states, moves) in zip(self._connections, inboxes):
+                    connection.send(("expand", states, parent_states, moves))
+
+                # On attend les réponses sans bloquer l'interface
+                results = [None] * self.workers
+                while any(result is None for result in results):
+                    yield "CALCULATING"
+                    for i, connection in enumerate(self._connections):
+                        if results[i] is None and connection.poll(0.01):
+                            results[i] = connection.recv()
+
+                self.nodes_expanded += sum(result[-1] for result in results)
+                goals = [result for result in results if result[0] == "goal"]
+                if goals:
+                    _, state, parent, move, _ = goals[0]
+                    self.moves = self._moves_from_path(self._path_from_shards(state, parent, move))
+                    print("Solution trouvée avec les mouvements :", self.moves)
+                    yield "SOLVED"
+                    return
+
+                # Échange des successeurs : chaque processus reçoit ceux qui lui appartiennent
+                inboxes = [(array("q"), array("q"), array("q")) for _ in range(self.workers)]
+                for _, outgoing, _ in results:
+                    for inbox, bucket in zip(inboxes, outgoing):
+                        for column, values in zip(inbox, bucket):
+                            column.extend(values)
+
+            print("Aucune solution trouvée.")
+            yield "NO_SOLUTION"
+        finally:
+            self._stop_workers()
@@ -0,0 +1,171 @@
+import collections
+import mmap
+import os
+
+# Nombre de couples traités entre deux pauses de la construction (voir PatternDatabase.build)
+BUILD_STEP = 4096
+
+# Dossier des fichiers gardés d'une exécution à l'autre (bases de motifs, solutions) : le
+# cache de l'utilisateur, ou le dossier donné par la variable d'environnement RASENDE_ROBOTER_CACHE
+CACHE_DIR = os.environ.get("RASENDE_ROBOTER_CACHE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")), "rasende_roboter")
+
+
+class PatternDatabase:
+    """
+    Base de motifs pour une cible : pour chaque couple (case du robot de la cible, case d'un
+    robot bloqueur), le nombre minimal de déplacements pour amener le robot de la cible sur la
+    cible, indice t * cases + b.
+
+    Le sous-problème à deux robots est relâché comme la carte de distance du plateau : les
+    robots hors du motif peuvent arrêter un robot n'importe où sur son trajet. Chaque
+    déplacement du vrai jeu est donc un déplacement du sous-problème (ou ne le change pas s'il
+    concerne un autre robot) : la valeur est admissible, et le maximum sur les bloqueurs aussi.
+    Par rapport à la carte de distance, elle tient compte d'un bloqueur placé sur le chemin,
+    mais le gain reste faible : la base n'est utilisée que sur demande (voir AStartPlayer).
+
+    La base est écrite une fois par disposition de murs et par cible dans CACHE_DIR (un octet
+    par couple, 64 Ko pour un plateau 16x16) puis projetée en mémoire en lecture seule.
+    """
+
+    def __init__(self, board, target_cell, cache_dir=CACHE_DIR):
+        """
+        Ouvre la base si elle a déjà été écrite, sinon elle est à construire avec build().
+
+        Args:
+            board (Board): Le plateau.
+            target_cell (int): Indice de la case cible.
+            cache_dir (str): Dossier des fichiers de bases de motifs.
+        """
+        self.board = board
+        self.target_cell = target_cell
+        self.cache_dir = cache_dir
+        self.cells = board.BOARD_SIZE * board.BOARD_SIZE
+        self.distances = board.distance_map(target_cell)
+        self.path = os.path.join(cache_dir, f"pdb_{board.layout_key()}_{target_cell}.bin")
+        self.table = None
+        if os.path.exists(self.path):
+            self._open()
+
+    def _open(self):
+        with open(self.path, "rb") as file:
+            self.table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def build(self):
+        """
+        Construit la base si elle n'est pas encore écrite, par étapes : l'appelant garde la
+        main entre deux étapes (et peut arrêter la construction, qui reprendra de zéro).
+
+        Yields:
+            None: Après chaque étape de BUILD_STEP couples.
+        """
+        if self.table is not None:
+            return
+        table = yield from self._build(self.board, self.target_cell)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Écriture atomique : un fichier présent est toujours complet (un fichier temporaire
+        # par processus, la base peut être construite en même temps par un autre joueur)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(table)
+        os.replace(temporary, self.path)
+        self._open()
+
+    def _build(self, board, target_cell):
+        """
+        Calcule la base par BFS inverse sur les couples de cases, depuis les couples où le robot
+        de la cible est sur la cible.
+
+        Args:
+            board (Board): Le plateau.
+            target_cell (int): Indice de la case cible.
+
+        Yields:
+            None: Après chaque étape de BUILD_STEP couples.
+
+        Returns:
+            bytearray: La distance de chaque couple (UNREACHABLE si la cible est inaccessible).
+        """
+        cells = self.cells
+        size = board.BOARD_SIZE
+        stop_table = board.stop_table
+        steps = [dy * size + dx for _, _, _, dy, dx in board.DIRECTIONS]
+        unreachable = board.UNREACHABLE
+
+        table = bytearray([unreachable]) * (cells * cells)
+        queue = collections.deque()
+        for blocker in range(cells):
+            if blocker != target_cell:
+                table[target_cell * cells + blocker] = 0
+                queue.append((target_cell, blocker))
+
+        # Les prédécesseurs d'un couple : l'un des deux robots revient en arrière sur un rayon,
+        # sans traverser l'autre robot (les murs bloquent dans les deux sens)
+        processed = 0
+        while queue:
+            processed += 1
+            if processed % BUILD_STEP == 0:
+                yield
+            robot, blocker = queue.popleft()
+            distance = table[robot * cells + blocker] + 1
+            for moving, other, moving_first in ((robot, blocker, True), (blocker, robot, False)):
+                if board.center_mask[moving]:
+                    continue  # On ne peut pas arriver au centre par un déplacement
+                for d in range(len(steps)):
+                    back = d ^ 1
+                    step = steps[back]
+                    end = stop_table[moving * 4 + back]
+                    cell = moving
+                    while cell != end:
+                        cell += step
+                        if cell == other:
+                            break
+                        index = cell * cells + other if moving_first else other * cells + cell
+                        if table[index] == unreachable:
+                            table[index] = distance
+                            queue.append((cell, other) if moving_first else (other, cell))
+
+        # Un robot ne peut pas s'arrêter au centre mais peut y être placé au départ : on donne à
+        # ces couples la meilleure valeur après un déplacement (deux passes si les deux y sont)
+        center = [cell for cell in range(cells) if board.center_mask[cell]]
+        pairs = [(robot, blocker) for robot in center for blocker in range(cells)]
+        pairs += [(robot, blocker) for robot in range(cells) for blocker in center]
+        for _ in range(2):
+            for processed, (robot, blocker) in enumerate(pairs):
+                if processed % BUILD_STEP == 0:
+                    yield
+                if robot == blocker or robot == target_cell:
+                    continue
+                best = table[robot * cells + blocker]
+                for moving, other, moving_first in ((robot, blocker, True), (blocker, robot, False)):
+                    for d, step in enumerate(steps):
+                        end = stop_table[moving * 4 + d]
+                        cell = moving
+                        while cell != end:
+                            cell += step
+                            if cell == other:
+                                break
+                            index = cell * cells + other if moving_first else other * cells + cell
+                            best = min(best, table[index] + 1)
+                table[robot * cells + blocker] = best
+        return table
+
+    def heuristic(self, robot_cell, blocker_cells):
+        """
+        Heuristique admissible pour un état : le maximum de la base sur tous les bloqueurs.
+
+        Args:
+            robot_cell (int): Case du robot de la cible.
+            blocker_cells (list): Cases des autres robots.
+
+        Returns:
+            int: Borne inférieure du nombre de déplacements (UNREACHABLE si impossible).
+        """
+        if not blocker_cells:
+            return self.distances[robot_cell]
+        row = robot_cell * self.cells
+        return max(self.table[row + blocker] for blocker in blocker_cells)
+
+    def close(self):
+        if self.table is not None:
+            self.table.close()
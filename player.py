@@ -1,8 +1,14 @@
-import copy
-
 import pygame
 import heapq
 import collections
+import json
+import os
+import time
+from array import array
+
+from layer_files import LayerWriter, difference, read_layer, unique, write_run
+from pattern_database import PatternDatabase
+from visited import VisitedSetFull, create_visited_set, mix64
 
 
 class Player:
@@ -18,43 +24,377 @@ class Player:
         self.turn = 1 # Numéro du tour du joueur
         self.moves = []  # Liste des mouvements effectués par le joueur
         self.selected_robot = None  # Robot actuellement sélectionné par le joueur
+        self.canonical = False  # Réduction des robots bloqueurs interchangeables (voir _canonical_state)
+        self.gave_up = False  # Le joueur a abandonné la cible en cours
+        self.engine = None  # Type d'IA choisi dans le menu (clé du cache des solutions)
+        # Une recherche menée à son terme rend une solution de longueur minimale (voir SolverCache)
+        self.exact = False
+
+        # Limites de la recherche des IA et informations sur la dernière recherche (voir solve)
+        self.budget = None
+        self.cancel_requested = False
+        self.nodes_expanded = 0
+        self.lower_bound = 0  # Aucune solution n'a moins de lower_bound coups
+        self.search_report = None
+        self.best_moves = None  # Meilleure solution trouvée jusqu'ici par une recherche à tout moment
+        # Longueur maximale utile d'une solution : le second joueur d'un tour doit faire strictement
+        # mieux que le premier, les branches plus longues sont élaguées (None : pas de limite)
+        self.max_length = None
+
+    def _start_search(self):
+        """
+        Prépare une recherche pour la cible actuelle : fixe l'ordre des couleurs (le robot de la
+        couleur de la cible en premier, puis les autres dans l'ordre du plateau) et mémorise la
+        case cible une fois pour toutes en dehors des états.
 
-    def _state_to_tuple(self, state):
+        Returns:
+            int: L'état de départ compacté, ou None si la cible ne peut pas être atteinte : aucun
+            robot n'a sa couleur, ou même dans le problème relâché de la carte de distance (les
+            autres robots peuvent arrêter celui de la cible n'importe où) elle est inaccessible.
         """
-        Convertit un état en un tuple hachable (dans le but d'optimiser  le temps)
-        pour suivre les états visités. L'état inclut les positions des robots et la cible actuelle.
+        target = self.board.get_current_target()
+        robots = sorted(self.board.robots, key=lambda r: r["color"] != target["color"])
+
+        self._colors = [r["color"] for r in robots]
+        self._cell_bits = max(8, (self.board.BOARD_SIZE ** 2 - 1).bit_length())
+        self._cell_mask = (1 << self._cell_bits) - 1
+        self._target_cell = self.board.cell_index(target["position"])
+        size = self.board.BOARD_SIZE
+        self._steps = [dy * size + dx for _, _, _, dy, dx in self.board.DIRECTIONS]
+
+        self._start_cells = [self.board.cell_index(r["position"]) for r in robots]
+
+        if not robots or robots[0]["color"] != target["color"]:
+            print("Aucun robot de la couleur de la cible.")
+            return None
+
+        # Pré-test en quelques microsecondes (la carte est gardée par le plateau) qui évite de
+        # parcourir tout l'espace des états pour conclure qu'il n'y a pas de solution
+        if self.board.distance_map(self._target_cell)[self._start_cells[0]] == self.board.UNREACHABLE:
+            print("La cible est inaccessible, même en plaçant librement les autres robots.")
+            return None
+        return self._canonical_state(self._pack_state(self._start_cells))
+
+    def _pack_state(self, cells):
+        """
+        Compacte les cases des robots (dans l'ordre des couleurs de la recherche) en un seul
+        entier : un octet par robot, le robot de la cible dans l'octet de poids faible.
 
         Args:
-            state (tuple): L'état sous la forme (robots, cible).
+            cells (list): Indices des cases des robots.
 
         Returns:
-            tuple: Une représentation unique et hachable de l'état.
+            int: L'état compacté.
+        """
+        state = 0
+        for i, cell in enumerate(cells):
+            state |= cell << (self._cell_bits * i)
+        return state
+
+    def _unpack_state(self, state):
         """
-        robots, target = state
+        Décompacte un état en la liste des cases des robots.
 
-        robots_tuple = tuple((tuple(r["position"]), r["color"]) for r in robots)
-        target_tuple = (target["position"], target["color"])
+        Args:
+            state (int): L'état compacté.
 
-        return robots_tuple + target_tuple
+        Returns:
+            list: Indices des cases des robots, dans l'ordre des couleurs de la recherche.
+        """
+        return [(state >> (self._cell_bits * i)) & self._cell_mask for i in range(len(self._colors))]
 
-    def _tuple_to_state(self, state_tuple):
+    def _canonical_state(self, state):
         """
-            Convertit une représentation sous forme de tuple en une structure d'état.
+        Seul le robot de la couleur de la cible doit l'atteindre, les autres ne servent que
+        d'obstacles et leur couleur n'a pas d'importance. En mode canonique on garde donc la
+        case du robot de la cible puis les cases des bloqueurs triées, ce qui regroupe tous les
+        états qui ne diffèrent que par une permutation des bloqueurs.
 
-            Args:
-                state_tuple (tuple): Représentation tuple de l'état.
+        Args:
+            state (int): L'état compacté.
 
-            Returns:
-                tuple: Un état sous forme de (robots, cible).
-            """
-        robots_tuple = state_tuple[:-2]
-        target_tuple = state_tuple[-2:]
+        Returns:
+            int: L'état canonique (l'état lui-même si le mode canonique est désactivé).
+        """
+        if not self.canonical:
+            return state
+        cells = self._unpack_state(state)
+        return self._pack_state(cells[:1] + sorted(cells[1:]))
+
+    def _is_goal(self, state):
+        """
+        Vérifie si le robot de la couleur de la cible est sur la cible.
+
+        Args:
+            state (int): L'état compacté.
+
+        Returns:
+            bool: True si la cible est atteinte.
+        """
+        return state & self._cell_mask == self._target_cell
+
+    def _successors(self, state):
+        """
+        Génère tous les états atteignables en un déplacement.
+
+        Args:
+            state (int): L'état compacté.
+
+        Yields:
+            tuple: (case de départ, indice de la direction, case d'arrivée, nouvel état).
+        """
+        cells = self._unpack_state(state)
+        occupancy = self.board.occupancy(cells)
+        for i, cell in enumerate(cells):
+            for d in range(len(self.board.DIRECTIONS)):
+                stop = self.board.slide(cell, d, occupancy)
+                if stop != cell:
+                    if self.canonical and i:
+                        # Bloqueur déplacé : on retrie directement les cases des bloqueurs
+                        blockers = cells[1:]
+                        blockers[i - 1] = stop
+                        blockers.sort()
+                        new_state = self._pack_state(cells[:1] + blockers)
+                    else:
+                        # Seul l'octet du robot déplacé change
+                        new_state = state + ((stop - cell) << (self._cell_bits * i))
+                    yield cell, d, stop, new_state
+
+    def _pruned_successors(self, state, last_move):
+        """
+        Génère les successeurs d'un état en écartant les déplacements inutiles compte tenu du
+        dernier déplacement effectué :
+        - le retour immédiat du robot qui vient de bouger (ramène à l'état parent, ou à un état
+          atteignable directement depuis le parent) ;
+        - pour deux déplacements indépendants de robots différents, qui donnent le même état
+          dans les deux ordres, seul l'ordre canonique (case de départ croissante) est gardé.
+
+        Args:
+            state (int): L'état compacté.
+            last_move (tuple): Dernier déplacement (case de départ, direction, case d'arrivée),
+                ou None pour l'état de départ.
+
+        Yields:
+            tuple: (case de départ, indice de la direction, case d'arrivée, nouvel état).
+        """
+        if last_move is None:
+            yield from self._successors(state)
+            return
+
+        last_cell, last_direction, last_new_cell = last_move
+        for cell, direction, new_cell, new_state in self._successors(state):
+            if cell == last_new_cell:
+                # Même robot : les directions vont par paires (up/down, left/right). Un robot parti
+                # du centre ne peut pas y revenir, son retour n'est donc pas un aller-retour.
+                if direction == last_direction ^ 1 and not self.board.center_mask[last_cell]:
+                    continue
+            elif cell < last_cell and self._independent_moves(last_move, (cell, direction, new_cell)):
+                continue
+            yield cell, direction, new_cell, new_state
+
+    def _on_slide(self, cell, move):
+        """
+        Vérifie si une case est sur le trajet d'un déplacement, case d'arrêt comprise, ou juste
+        après (la case dont l'obstacle a arrêté le robot).
+
+        Args:
+            cell (int): Indice de la case.
+            move (tuple): Déplacement (case de départ, direction, case d'arrivée).
+
+        Returns:
+            bool: True si la case est sur le trajet.
+        """
+        from_cell, direction, to_cell = move
+        beyond = to_cell + self._steps[direction]
+        if direction < 2:  # Déplacement vertical : même colonne
+            same_line = cell % self.board.BOARD_SIZE == from_cell % self.board.BOARD_SIZE
+        else:  # Déplacement horizontal : même ligne
+            same_line = cell // self.board.BOARD_SIZE == from_cell // self.board.BOARD_SIZE
+        return same_line and min(from_cell, beyond) <= cell <= max(from_cell, beyond)
+
+    def _independent_moves(self, first, second):
+        """
+        Deux déplacements de robots différents sont indépendants si aucun des deux robots ne se
+        trouve, avant ou après son déplacement, sur le trajet de l'autre : les faire dans un
+        ordre ou dans l'autre donne alors exactement le même état.
+
+        Args:
+            first (tuple): Premier déplacement (case de départ, direction, case d'arrivée).
+            second (tuple): Second déplacement.
+
+        Returns:
+            bool: True si les déplacements commutent.
+        """
+        return not (self._on_slide(first[0], second) or self._on_slide(first[2], second)
+                    or self._on_slide(second[0], first) or self._on_slide(second[2], first))
+
+    def _path_to(self, parents, state):
+        """
+        Reconstruit le chemin menant à un état en remontant les pointeurs vers les parents.
+
+        Args:
+            parents (dict): Pour chaque état visité, (état parent, case de départ, direction,
+                case d'arrivée) du déplacement qui y mène, ou None pour l'état de départ.
+            state (int): L'état final.
 
-        # Reconstruit les robots et la cible à partir du tuple
-        robots = [{"position": pos, "color": color} for pos, color in robots_tuple]
-        target = {"position": target_tuple[0], "color": target_tuple[1]}
-        return robots, target
+        Returns:
+            list: Déplacements (case de départ, direction, case d'arrivée) depuis le départ.
+        """
+        path = []
+        while parents[state] is not None:
+            state, cell, direction, new_cell = parents[state]
+            path.append((cell, direction, new_cell))
+        path.reverse()
+        return path
+
+    def _pack_move(self, move):
+        """
+        Compacte un déplacement (case de départ, direction, case d'arrivée) en un entier.
 
+        Args:
+            move (tuple): Le déplacement.
+
+        Returns:
+            int: Le déplacement compacté.
+        """
+        cell, direction, new_cell = move
+        return (((cell << self._cell_bits) | new_cell) << 2) | direction
+
+    def _unpack_move(self, packed):
+        """
+        Décompacte un déplacement compacté par _pack_move.
+
+        Args:
+            packed (int): Le déplacement compacté.
+
+        Returns:
+            tuple: (case de départ, direction, case d'arrivée).
+        """
+        cells = packed >> 2
+        return cells >> self._cell_bits, packed & 3, cells & self._cell_mask
+
+    def _backtrack_layers(self, layers, state):
+        """
+        Reconstruit le chemin vers un état sans pointeurs vers les parents, à partir des couches
+        d'une recherche en largeur : on cherche dans chaque couche précédente un état dont
+        l'état courant est un successeur. Le coût (un parcours des couches) n'est payé qu'une
+        fois, quand la solution est trouvée.
+
+        Args:
+            layers (list): Couches d'états (itérables), la dernière contenant l'état.
+            state (int): L'état final.
+
+        Returns:
+            list: Déplacements (case de départ, direction, case d'arrivée) depuis le départ.
+        """
+        path = []
+        for layer in reversed(layers[:-1]):
+            move = None
+            for parent in layer:
+                move = next((m[:3] for m in self._successors(parent) if m[3] == state), None)
+                if move:
+                    break
+            path.append(move)
+            state = parent
+        path.reverse()
+        return path
+
+    def _moves_from_path(self, path):
+        """
+        Convertit un chemin de la recherche au format de l'historique des mouvements. Les
+        déplacements sont identifiés par leur case de départ (en mode canonique un état ne dit
+        pas quel bloqueur est où), on les rejoue donc depuis la position de départ réelle.
+
+        Args:
+            path (list): Déplacements (case de départ, direction, case d'arrivée).
+
+        Returns:
+            list: Déplacements (couleur, direction, position).
+        """
+        cells = list(self._start_cells)
+        moves = []
+        for from_cell, direction, to_cell in path:
+            robot = cells.index(from_cell)
+            cells[robot] = to_cell
+            moves.append((self._colors[robot], self.board.DIRECTIONS[direction][0],
+                          self.board.cell_position(to_cell)))
+        return moves
+
+    def _cannot_beat(self, length):
+        """
+        Vérifie si une solution de cette longueur est inutile car plus longue que self.max_length.
+
+        Args:
+            length (int): Longueur (ou borne inférieure de la longueur) d'une solution.
+
+        Returns:
+            bool: True si la branche peut être abandonnée.
+        """
+        return self.max_length is not None and length > self.max_length
+
+    def cancel(self):
+        """
+        Demande l'arrêt de la recherche en cours, par exemple à la fermeture de la fenêtre.
+        La recherche s'arrête à sa prochaine étape de calcul avec le résultat "CANCELLED".
+        """
+        self.cancel_requested = True
+
+    def solve(self):
+        """
+        Exécute play() en vérifiant le budget et les demandes d'annulation à chaque étape de
+        calcul. Quand la recherche est arrêtée, self.search_report garde ce qu'elle a appris :
+        raison, durée, états développés, mémoire et borne inférieure sur la longueur.
+
+        Yields:
+            str: Les résultats de play(), ou bien "BUDGET_EXCEEDED" si une limite du budget est
+            dépassée, "CANCELLED" si cancel() a été appelé. Si le budget est dépassé alors
+            qu'une recherche à tout moment a déjà une solution (self.best_moves), celle-ci est
+            rendue avec "SOLVED". "CANNOT_BEAT" si aucune solution d'au plus self.max_length
+            coups n'existe.
+        """
+        self.cancel_requested = False
+        self.nodes_expanded = 0
+        self.lower_bound = 0
+        self.search_report = None
+        self.best_moves = None
+        if self.budget is not None:
+            self.budget.start()
+        start_time = time.monotonic()
+
+        if self._cannot_beat(0):
+            yield "CANNOT_BEAT"
+            return
+
+        search = self.play()
+        try:
+            for result in search:
+                if result == "CALCULATING":
+                    if self.cancel_requested:
+                        reason = "cancelled"
+                    elif self.budget is not None:
+                        reason = self.budget.exceeded(self.nodes_expanded)
+                    else:
+                        reason = None
+
+                    if reason:
+                        self.search_report = {
+                            "reason": reason,
+                            "elapsed": time.monotonic() - start_time,
+                            "nodes": self.nodes_expanded,
+                            "memory": self.budget.memory if self.budget is not None else None,
+                            "lower_bound": self.lower_bound,
+                        }
+                        print(f"Recherche arrêtée ({reason}) après {self.nodes_expanded} états, "
+                              f"aucune solution en moins de {self.lower_bound} coups")
+                        if reason != "cancelled" and self.best_moves is not None:
+                            self.moves = list(self.best_moves)
+                            yield "SOLVED"
+                        else:
+                            yield "CANCELLED" if reason == "cancelled" else "BUDGET_EXCEEDED"
+                        return
+                yield result
+        finally:
+            search.close()  # Libère les ressources de la recherche (processus, fichiers...)
 
     def set_board(self, board):
         """
@@ -77,6 +417,7 @@ class Player:
         """
         self.moves.clear()
         self.selected_robot = None
+        self.gave_up = False
 
 class HumanPlayer(Player):
     def __init__(self, name):
@@ -182,14 +523,30 @@ class HumanPlayer(Player):
 
 
 class BFSPlayer(Player):
-    def __init__(self, name):
+    def __init__(self, name, canonical=False, visited=None, memory_cap=None, all_solutions=False, budget=None):
         """
         Initialise un joueur utilisant l'algorithme de recherche en largeur (BFS).
 
         Args:
             name (str): Nom du joueur.
+            canonical (bool): Si True, les robots bloqueurs sont considérés interchangeables.
+            visited (str, optional): Ensemble d'états visités compact à utiliser ("set", "hash"
+                ou "bitset", voir visited.py). Dans ce cas la recherche se fait couche par couche
+                sans pointeurs vers les parents. None pour la recherche classique.
+            memory_cap (int, optional): Mémoire maximale de l'ensemble des états visités, en octets.
+            all_solutions (bool): Si True, compte toutes les solutions optimales et permet de les
+                énumérer avec optimal_solutions (voir _play_all_solutions).
+            budget (SearchBudget, optional): Limites de la recherche (voir Player.solve).
         """
         super().__init__(name)
+        self.exact = True
+        self.canonical = canonical
+        self.visited = visited
+        self.memory_cap = memory_cap
+        self.all_solutions = all_solutions
+        self.budget = budget
+        self.solution_count = None  # Nombre de solutions optimales (mode all_solutions)
+        self._solution_dag = None  # (parents, états but) de la dernière recherche all_solutions
 
     def play(self):
         """
@@ -199,67 +556,428 @@ class BFSPlayer(Player):
             str: "CALCULATING" lorsque l'algorithme est en cours de calcul.
             str: "SOLVED" si une solution est trouvée.
             str: "NO_SOLUTION" si aucune solution n'est trouvée.
+            str: "CANNOT_BEAT" si aucune solution n'a au plus self.max_length coups.
+            str: "BUDGET_EXCEEDED" si l'ensemble des états visités compact atteint memory_cap.
         """
-
-        # Initialisation de l'état de départ (donc on met la liste de robots, avec l'objectif)
-        start_state = (self.board.robots, self.board.get_current_target())
-        queue = collections.deque([(start_state, [])])  # On rajoute à notre liste l'état
-        visited = set() # Ensemble des états déjà visités
-
-        # Ajout du premier état aux états visités
-        start_state_tuple = self._state_to_tuple(start_state)
-        visited.add(start_state_tuple)
-
+        if self.all_solutions:
+            yield from self._play_all_solutions()
+            return
+        if self.visited:
+            yield from self._play_layered()
+            return
+
+        # Initialisation de l'état de départ (les positions des robots compactées dans un entier)
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+
+        queue = collections.deque([start_state])  # On rajoute à notre liste l'état
+        # États déjà visités, avec pour chacun le parent et le déplacement qui y mène
+        parents = {start_state: None}
+
+        if self._is_goal(start_state):
+            self.moves = []
+            yield "SOLVED"
+            return
+
+        self.lower_bound = 1
+        layer_remaining = 1  # États de la couche courante restant à développer
+        # Avec une longueur maximale, la carte de distance écarte les états trop loin de la cible
+        distances = self.board.distance_map(self._target_cell) if self.max_length is not None else None
         while queue:
             yield "CALCULATING"  # Indique que le calcul est en cours
 
-            # On récupère le premier état dans la file
-            current_state, path = queue.popleft()
-            robots, target = current_state
-
-            # On vérifie si la cible est atteinte
-            for robot in robots:
-                if robot["position"] == target["position"] and robot["color"] == target["color"]:
-                    # Si la solution est trouvée, on l'affiche et on retourne "SOLVED"
-                    print("Solution trouvée avec les mouvements :", path)
-                    for move in path:
-                        print(f"Déplacement : Robot {move[0]} vers {move[1]} jusqu'à {move[2]}")
-                    self.moves = path # On stocke les mouvements dans l'historiques
-                    yield "SOLVED"
-                    return
-
-            # Génération des états suivants
-            for robot in robots:
-                # Récupère les mouvements possibles pour ce robot
-                possible_moves = self.board.getPossibleMovesOfRobot(robot["position"], robots)
-                for direction, new_position in possible_moves.items():
-                    if new_position:
-                        # Pour chaque nouvelle position possibles, on crée un nouvel état avec le robot déplacé
-                        new_robots = [
-                            {"color": r["color"], "position": new_position if r == robot else r["position"]}
-                            for r in robots
-                        ]
-                        new_state = (new_robots, target)
-                        new_state_tuple = self._state_to_tuple(new_state)
-
-                        # Ajoute le nouvel état à la file s'il n'a pas encore été visité
-                        if new_state_tuple not in visited:
-                            visited.add(new_state_tuple)
-                            queue.append((new_state, path + [(robot["color"], direction, new_position)]))
+            # Quand une couche est terminée, aucune solution n'est plus courte que la suivante
+            if layer_remaining == 0:
+                self.lower_bound += 1
+                layer_remaining = len(queue)
+            layer_remaining -= 1
+            if self._cannot_beat(self.lower_bound):
+                break
 
+            # On récupère le premier état dans la file
+            state = queue.popleft()
+            self.nodes_expanded += 1
+            last_move = parents[state][1:] if parents[state] else None
+
+            # Génération des états suivants (sans les déplacements inutiles)
+            for cell, direction, new_cell, new_state in self._pruned_successors(state, last_move):
+                # Ajoute le nouvel état à la file s'il n'a pas encore été visité
+                if new_state not in parents:
+                    if distances is not None and self._cannot_beat(self.lower_bound + distances[new_state & self._cell_mask]):
+                        continue
+                    parents[new_state] = (state, cell, direction, new_cell)
+
+                    # On vérifie si la cible est atteinte dès la génération, sans attendre
+                    # de dépiler toute la couche suivante
+                    if self._is_goal(new_state):
+                        # Si la solution est trouvée, on reconstruit le chemin, on l'affiche et on retourne "SOLVED"
+                        self.moves = self._moves_from_path(self._path_to(parents, new_state))
+                        print("Solution trouvée avec les mouvements :", self.moves)
+                        for move in self.moves:
+                            print(f"Déplacement : Robot {move[0]} vers {move[1]} jusqu'à {move[2]}")
+                        yield "SOLVED"
+                        return
+
+                    queue.append(new_state)
+
+        if self.max_length is not None:
+            print(f"Aucune solution en {self.max_length} coups ou moins.")
+            yield "CANNOT_BEAT"
+            return
         print("Aucune solution trouvée.")
         yield "NO_SOLUTION"  # Dans le cas où on ne trouve pas de solution
 
 
+    def _play_layered(self):
+        """
+        BFS couche par couche avec un ensemble d'états visités compact. Chaque couche est gardée
+        dans un array('Q') (8 octets par état) et le chemin est reconstruit à la fin avec
+        _backtrack_layers, ce qui évite le dictionnaire de parents.
+
+        Yields:
+            str: "CALCULATING", "SOLVED", "NO_SOLUTION" ou "CANNOT_BEAT" comme play().
+            str: "BUDGET_EXCEEDED" si l'ensemble des états visités atteint self.memory_cap
+            (self.search_report a la raison "memory").
+        """
+        start_time = time.monotonic()
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+        if self._is_goal(start_state):
+            self.moves = []
+            yield "SOLVED"
+            return
+
+        distances = self.board.distance_map(self._target_cell) if self.max_length is not None else None
+        visited = None
+        try:
+            visited = create_visited_set(self.visited, self._cell_bits * len(self._colors), self.memory_cap)
+            visited.add(start_state)
+            layers = [array("Q", [start_state])]
+            last_moves = None  # Dernier déplacement compacté de chaque état de la couche courante
+
+            while layers[-1]:
+                next_layer = array("Q")
+                next_moves = array("Q")
+                self.lower_bound = len(layers)
+                if self._cannot_beat(self.lower_bound):
+                    break
+
+                for i, state in enumerate(layers[-1]):
+                    yield "CALCULATING"
+                    self.nodes_expanded += 1
+                    last_move = self._unpack_move(last_moves[i]) if last_moves else None
+
+                    for cell, direction, new_cell, new_state in self._pruned_successors(state, last_move):
+                        if distances is not None and self._cannot_beat(self.lower_bound + distances[new_state & self._cell_mask]):
+                            continue
+                        if not visited.add(new_state):
+                            continue
+                        if self._is_goal(new_state):
+                            path = self._backtrack_layers(layers, state) + [(cell, direction, new_cell)]
+                            self.moves = self._moves_from_path(path)
+                            print("Solution trouvée avec les mouvements :", self.moves)
+                            print(f"{len(visited)} états visités, {visited.memory_usage()} octets")
+                            yield "SOLVED"
+                            return
+                        next_layer.append(new_state)
+                        next_moves.append(self._pack_move((cell, direction, new_cell)))
+
+                layers.append(next_layer)
+                last_moves = next_moves
+        except VisitedSetFull as error:
+            # La recherche n'est pas terminée : on ne peut pas conclure qu'il n'y a pas de solution
+            self.search_report = {
+                "reason": "memory",
+                "elapsed": time.monotonic() - start_time,
+                "nodes": self.nodes_expanded,
+                "memory": visited.memory_usage() if visited is not None else None,
+                "lower_bound": self.lower_bound,
+            }
+            print(f"Limite de mémoire atteinte : {error}")
+            yield "BUDGET_EXCEEDED"
+            return
+        finally:
+            if visited is not None:
+                visited.close()
+
+        if self.max_length is not None:
+            print(f"Aucune solution en {self.max_length} coups ou moins.")
+            yield "CANNOT_BEAT"
+            return
+        print("Aucune solution trouvée.")
+        yield "NO_SOLUTION"
+
+
+    def _play_all_solutions(self):
+        """
+        BFS qui construit le graphe des couches jusqu'à la profondeur optimale : chaque état
+        garde tous ses parents de la couche précédente, pas seulement le premier. Le nombre de
+        chemins vers un état est la somme de ceux de ses parents, ce qui compte les solutions
+        optimales couche par couche sans les énumérer. Les déplacements ne sont pas élagués :
+        deux ordres différents de mêmes déplacements sont deux solutions distinctes.
+
+        Yields:
+            str: "CALCULATING", "SOLVED", "NO_SOLUTION" ou "CANNOT_BEAT" comme play().
+        """
+        self.solution_count = None
+        self._solution_dag = None
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+
+        # Parents de chaque état : (état parent, case de départ, direction, case d'arrivée)
+        parents = {start_state: []}
+        # Nombre de chemins vers chaque état de la couche courante (les couches précédentes ne
+        # servent plus au comptage)
+        counts = {start_state: 1}
+        goals = [start_state] if self._is_goal(start_state) else []
+        distances = self.board.distance_map(self._target_cell) if self.max_length is not None else None
+
+        depth = 0
+        while counts and not goals:
+            depth += 1
+            self.lower_bound = depth
+            if self._cannot_beat(depth):
+                break
+
+            next_counts = {}
+            for state, count in counts.items():
+                yield "CALCULATING"
+                self.nodes_expanded += 1
+                for cell, direction, new_cell, new_state in self._successors(state):
+                    if new_state in next_counts:
+                        # Autre chemin de même longueur vers un état de la couche suivante
+                        next_counts[new_state] += count
+                        parents[new_state].append((state, cell, direction, new_cell))
+                    elif new_state not in parents:
+                        if distances is not None and self._cannot_beat(depth + distances[new_state & self._cell_mask]):
+                            continue
+                        next_counts[new_state] = count
+                        parents[new_state] = [(state, cell, direction, new_cell)]
+                        if self._is_goal(new_state):
+                            goals.append(new_state)
+            counts = next_counts
+
+        if goals:
+            self.solution_count = sum(counts[goal] for goal in goals)
+            self._solution_dag = (parents, goals)
+            self.moves = next(self.optimal_solutions())
+            print(f"{self.solution_count} solutions optimales en {len(self.moves)} coups, par exemple :", self.moves)
+            yield "SOLVED"
+            return
+
+        if self.max_length is not None:
+            print(f"Aucune solution en {self.max_length} coups ou moins.")
+            yield "CANNOT_BEAT"
+            return
+        print("Aucune solution trouvée.")
+        yield "NO_SOLUTION"
+
+    def optimal_solutions(self):
+        """
+        Génère une à une les solutions optimales de la dernière recherche en mode all_solutions,
+        par un parcours en profondeur du graphe des couches en remontant des états but vers le
+        départ. Aucune liste de solutions n'est construite : itertools.islice(..., k) donne les
+        k premières (toutes de longueur optimale, le graphe s'arrêtant à cette profondeur).
+
+        Yields:
+            list: Déplacements (couleur, direction, position) d'une solution.
+        """
+        if self._solution_dag is None:
+            return
+        parents, goals = self._solution_dag
+        for goal in goals:
+            # (état, déplacements de l'état jusqu'au but en liste chaînée (déplacement, suite))
+            stack = [(goal, None)]
+            while stack:
+                state, suffix = stack.pop()
+                if not parents[state]:
+                    path = []
+                    while suffix is not None:
+                        move, suffix = suffix
+                        path.append(move)
+                    yield self._moves_from_path(path)
+                    continue
+                for parent, cell, direction, new_cell in reversed(parents[state]):
+                    stack.append((parent, ((cell, direction, new_cell), suffix)))
+
+
+class ExternalBFSPlayer(BFSPlayer):
+    def __init__(self, name, work_dir, canonical=False, run_states=1 << 22, budget=None):
+        """
+        Initialise un joueur BFS hors mémoire : chaque couche de la recherche est écrite sur le
+        disque dans un fichier d'états compactés triés, et dédoublonnée contre les couches
+        précédentes par tri et fusion. Après chaque couche un point de reprise est enregistré,
+        une recherche interrompue reprend donc à la dernière profondeur complète.
+
+        Args:
+            name (str): Nom du joueur.
+            work_dir (str): Dossier des fichiers de couches et du point de reprise.
+            canonical (bool): Si True, les robots bloqueurs sont considérés interchangeables.
+            run_states (int): Nombre de successeurs gardés en mémoire avant d'être triés et
+                écrits dans un fichier temporaire.
+            budget (SearchBudget, optional): Limites de la recherche (voir Player.solve).
+        """
+        super().__init__(name, canonical, budget=budget)
+        self.work_dir = work_dir
+        self.run_states = run_states
+
+    def _layer_path(self, depth):
+        return os.path.join(self.work_dir, f"layer_{depth}.bin")
+
+    def _run_path(self, index):
+        return os.path.join(self.work_dir, f"run_{index}.bin")
+
+    def _checkpoint_path(self):
+        return os.path.join(self.work_dir, "checkpoint.json")
+
+    def _load_checkpoint(self, key):
+        """
+        Relit le point de reprise s'il correspond à la même recherche.
+
+        Args:
+            key (str): Identifiant de la recherche (plateau, état de départ, cible, mode).
+
+        Returns:
+            int: Dernière profondeur complète, ou None s'il faut repartir de zéro.
+        """
+        try:
+            with open(self._checkpoint_path()) as file:
+                checkpoint = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if checkpoint.get("key") != key:
+            return None
+        return checkpoint["depth"]
+
+    def _save_checkpoint(self, key, depth):
+        # Écriture atomique : on ne voit jamais un point de reprise à moitié écrit
+        path = self._checkpoint_path()
+        with open(path + ".tmp", "w") as file:
+            json.dump({"key": key, "depth": depth}, file)
+        os.replace(path + ".tmp", path)
+
+    def _clear_work_dir(self):
+        for file_name in os.listdir(self.work_dir):
+            if file_name.startswith(("layer_", "run_", "checkpoint")):
+                os.remove(os.path.join(self.work_dir, file_name))
+
+    def play(self):
+        """
+        Exécute la recherche en largeur couche par couche sur le disque.
+
+        Yields:
+            str: "CALCULATING" lorsque l'algorithme est en cours de calcul.
+            str: "SOLVED" si une solution est trouvée.
+            str: "NO_SOLUTION" si aucune solution n'est trouvée.
+            str: "CANNOT_BEAT" si aucune solution n'a au plus self.max_length coups.
+        """
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+        if self._is_goal(start_state):
+            self.moves = []
+            yield "SOLVED"
+            return
+
+        os.makedirs(self.work_dir, exist_ok=True)
+        key = f"{self.board.layout_key()}:{start_state}:{self._target_cell}:{self.canonical}:{','.join(self._colors)}"
+        depth = self._load_checkpoint(key)
+        if depth is None:
+            self._clear_work_dir()
+            with LayerWriter(self._layer_path(0)) as writer:
+                writer.append(start_state)
+            depth = 0
+            self._save_checkpoint(key, depth)
+        else:
+            print(f"Reprise de la recherche à la profondeur {depth}")
+
+        while True:
+            # Développement de la couche courante : les successeurs sont triés par paquets
+            runs = []
+            buffer = array("Q")
+            self.lower_bound = depth + 1
+            if self._cannot_beat(self.lower_bound):
+                print(f"Aucune solution en {self.max_length} coups ou moins.")
+                self._clear_work_dir()
+                yield "CANNOT_BEAT"
+                return
+            for state in read_layer(self._layer_path(depth)):
+                yield "CALCULATING"
+                self.nodes_expanded += 1
+                for cell, direction, new_cell, new_state in self._successors(state):
+                    if self._is_goal(new_state):
+                        layers = [read_layer(self._layer_path(d)) for d in range(depth + 1)]
+                        path = self._backtrack_layers(layers, state) + [(cell, direction, new_cell)]
+                        self.moves = self._moves_from_path(path)
+                        print("Solution trouvée avec les mouvements :", self.moves)
+                        self._clear_work_dir()
+                        yield "SOLVED"
+                        return
+                    buffer.append(new_state)
+                if len(buffer) >= self.run_states:
+                    write_run(self._run_path(len(runs)), buffer)
+                    runs.append(self._run_path(len(runs)))
+                    buffer = array("Q")
+            if buffer:
+                write_run(self._run_path(len(runs)), buffer)
+                runs.append(self._run_path(len(runs)))
+                buffer = None
+
+            # Fusion des paquets, sans les états déjà présents dans les couches précédentes
+            new_states = unique(heapq.merge(*(read_layer(run) for run in runs)))
+            seen_states = heapq.merge(*(read_layer(self._layer_path(d)) for d in range(depth + 1)))
+            with LayerWriter(self._layer_path(depth + 1)) as writer:
+                for state in difference(new_states, seen_states):
+                    writer.append(state)
+                    if writer.count % 4096 == 0:
+                        yield "CALCULATING"
+            for run in runs:
+                os.remove(run)
+
+            depth += 1
+            self._save_checkpoint(key, depth)
+            print(f"Couche {depth} : {writer.count} nouveaux états")
+
+            if writer.count == 0:
+                print("Aucune solution trouvée.")
+                self._clear_work_dir()
+                yield "NO_SOLUTION"
+                return
+
+
 class AStartPlayer(Player):
-    def __init__(self, name):
+    def __init__(self, name, canonical=False, optimal=False, epsilon=None, pattern_database=False, budget=None):
         """
         Initialise un joueur utilisant l'algorithme A* pour résoudre le problème.
 
         Args:
             name (str): Nom du joueur.
+            canonical (bool): Si True, les robots bloqueurs sont considérés interchangeables.
+            optimal (bool): Si True, utilise l'heuristique admissible de la carte de distance
+                (voir Board.distance_map) et garantit une solution de longueur minimale.
+            epsilon (float, optional): Si donné, A* pondéré à tout moment avec ce poids (>= 1)
+                sur l'heuristique, voir _play_anytime.
+            pattern_database (bool): Si True, les modes optimal et à tout moment utilisent la base
+                de motifs de la cible (voir PatternDatabase) plutôt que la carte de distance.
+            budget (SearchBudget, optional): Limites de la recherche (voir Player.solve).
         """
         super().__init__(name)
+        # Le mode à tout moment finit lui aussi sur une solution optimale quand la file est vide
+        self.exact = optimal or epsilon is not None
+        self.canonical = canonical
+        self.optimal = optimal
+        self.epsilon = epsilon
+        self.pattern_database = pattern_database
+        self._pattern_databases = {}  # (disposition des murs, case cible) -> PatternDatabase
+        self.budget = budget
+        self.suboptimality = None  # Longueur de la meilleure solution / borne inférieure prouvée
 
     def play(self):
         """
@@ -269,17 +987,38 @@ class AStartPlayer(Player):
             str: "CALCULATING" lorsque l'algorithme est en cours.
             str: "SOLVED" si une solution est trouvée.
             str: "NO_SOLUTION" si aucune solution n'est trouvée.
+            str: "CANNOT_BEAT" si aucune solution n'a au plus self.max_length coups (en mode
+            classique, sans réouverture des états, ce n'est pas garanti).
         """
-
-        # État de départ : positions des robots et cible actuelle
-        start_state = (self.board.robots, self.board.get_current_target())
+        if self.epsilon is not None:
+            yield from self._play_anytime()
+            return
+        if self.optimal:
+            yield from self._play_optimal()
+            return
+
+        # État de départ : positions des robots compactées, la cible est gardée à part
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+        if self._is_goal(start_state):
+            self.moves = []
+            yield "SOLVED"
+            return
+        target_position = self.board.cell_position(self._target_cell)
 
         # File de priorité pour gérer les états ouverts (avec heapq pour A*)
         opened = []
-        heapq.heappush(opened, (0, self._state_to_tuple(start_state), [])) # (coût, état, chemin)
+        heapq.heappush(opened, (0, start_state))  # (coût, état)
+
+        # États déjà explorés, avec pour chacun le parent et le déplacement qui y mène
+        closed = {start_state: None}
 
-        # Ensemble pour stocker les états déjà explorés
-        closed = set()
+        # Avec une longueur maximale, on garde la profondeur des états pour écarter ceux qui sont
+        # trop loin de la cible d'après la carte de distance
+        distances = self.board.distance_map(self._target_cell) if self.max_length is not None else None
+        depths = {start_state: 0}
 
         def heuristic(robot_position, target_position):
             """
@@ -301,48 +1040,426 @@ class AStartPlayer(Player):
             yield "CALCULATING"
 
             # Dépile l'état avec le coût le plus faible
-            cost, current_state_tuple, path = heapq.heappop(opened)
-
-            # Conversion du tuple en structure d'état exploitable
-            current_state = self._tuple_to_state(current_state_tuple)
-            robots, target = current_state
-
-            for robot in robots:
-                # Vérifie si un robot atteint la cible
-                if robot["position"] == target["position"] and robot["color"] == target["color"]:
-                    print("Solution trouvée avec les mouvements :", path)
-                    for move in path:
-                        print(f"Déplacement : Robot {move[0]} vers {move[1]} jusqu'à {move[2]}")
-                    self.moves = path
-                    yield "SOLVED"  # Retourne que la solution est trouvée
-                    return
-
-            # Génère les états suivants pour chaque mouvement possible
-            for robot in robots:
-                # Obtenir les mouvements possibles pour ce robot
-                possible_moves = self.board.getPossibleMovesOfRobot(robot["position"],robots)
-                for direction, new_position in possible_moves.items():
-                    if new_position:
-                        # Si le déplacement est valide ça crée un nouvel état avec le robot déplacé
-                        new_robots = copy.deepcopy(robots)
-                        for r in new_robots:
-                            if r["color"] == robot["color"]:
-                                r["position"] = new_position
-
-                        new_state = (new_robots, target)
-                        new_state_tuple = self._state_to_tuple(new_state)  # On reconvertit en tuple pour optimiser
-
-                        # Vérifie si cet état a déjà été exploré
-                        if new_state_tuple not in closed:
-                            closed.add(new_state_tuple) # Marque l'état comme visité
-                            # Calcule le coût total (g + h) -> chaque déplacement vaut le cout de 1
-                            new_cost = cost + 10 + heuristic(new_position, target["position"])
-                            #new_cost = cost + len(path) + heuristic(new_position, target["position"])
-
-                            # mettre len(path au lieu de 10)
-
-                            # Ajoute le nouvel état à la file ouverte
-                            heapq.heappush(opened, (
-                            new_cost, new_state_tuple, path + [(robot["color"], direction, new_position)]))
-
+            cost, state = heapq.heappop(opened)
+            self.nodes_expanded += 1
+            last_move = closed[state][1:] if closed[state] else None
+
+            # Génère les états suivants pour chaque mouvement utile
+            for cell, direction, new_cell, new_state in self._pruned_successors(state, last_move):
+                # Vérifie si cet état a déjà été exploré
+                if new_state not in closed:
+                    if distances is not None:
+                        depth = depths[state] + 1
+                        if self._cannot_beat(depth + distances[new_state & self._cell_mask]):
+                            continue
+                        depths[new_state] = depth
+                    closed[new_state] = (state, cell, direction, new_cell)  # Marque l'état comme visité
+
+                    # Vérifie si le robot de la cible l'atteint
+                    if self._is_goal(new_state):
+                        self.moves = self._moves_from_path(self._path_to(closed, new_state))
+                        print("Solution trouvée avec les mouvements :", self.moves)
+                        for move in self.moves:
+                            print(f"Déplacement : Robot {move[0]} vers {move[1]} jusqu'à {move[2]}")
+                        yield "SOLVED"  # Retourne que la solution est trouvée
+                        return
+
+                    # Calcule le coût total (g + h) -> chaque déplacement vaut le cout de 1
+                    new_position = self.board.cell_position(new_cell)
+                    new_cost = cost + 10 + heuristic(new_position, target_position)
+                    #new_cost = cost + len(path) + heuristic(new_position, target["position"])
+
+                    # mettre len(path au lieu de 10)
+
+                    # Ajoute le nouvel état à la file ouverte
+                    heapq.heappush(opened, (new_cost, new_state))
+
+        if self.max_length is not None:
+            yield "CANNOT_BEAT"
+            return
         yield "NO_SOLUTION" # Si la file est vide et aucune solution n'est trouvée
+
+    def _load_pattern_database(self):
+        """
+        Charge la base de motifs de la cible si le joueur l'utilise : elle est gardée une fois
+        par plateau et par cible, et construite par étapes au premier usage.
+
+        Yields:
+            str: "CALCULATING" pendant la construction (le budget et cancel() sont donc vérifiés).
+        """
+        if not self.pattern_database or len(self._colors) == 1:
+            return
+        key = (self.board.layout_key(), self._target_cell)
+        if key not in self._pattern_databases:
+            database = PatternDatabase(self.board, self._target_cell)
+            for _ in database.build():
+                yield "CALCULATING"
+            self._pattern_databases[key] = database
+
+    def _heuristic(self):
+        """
+        Renvoie l'heuristique admissible et cohérente des modes optimal et à tout moment : la
+        distance du robot de la cible dans la carte de distance, ou avec la base de motifs
+        (chargée par _load_pattern_database) le maximum sur les robots bloqueurs.
+
+        Returns:
+            function: Fonction qui donne, pour un état, une borne inférieure du nombre de
+            déplacements (UNREACHABLE si la cible est inaccessible).
+        """
+        cell_mask = self._cell_mask
+        if not self.pattern_database or len(self._colors) == 1:
+            distances = self.board.distance_map(self._target_cell)
+            return lambda state: distances[state & cell_mask]
+
+        database = self._pattern_databases[(self.board.layout_key(), self._target_cell)]
+        shifts = range(self._cell_bits, self._cell_bits * len(self._colors), self._cell_bits)
+        return lambda state: database.heuristic(state & cell_mask, [(state >> shift) & cell_mask for shift in shifts])
+
+    def _play_optimal(self):
+        """
+        A* optimal : f = g + h où g est le nombre de déplacements et h la distance du robot de la
+        cible dans la carte de distance (ou la base de motifs, voir _heuristic). h est admissible
+        et cohérente (un déplacement la change d'au plus 1), donc la première solution dépilée
+        est de longueur minimale.
+
+        Yields:
+            str: "CALCULATING", "SOLVED" ou "NO_SOLUTION" comme play().
+        """
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+        yield from self._load_pattern_database()
+        heuristic = self._heuristic()
+        unreachable = self.board.UNREACHABLE
+
+        h = heuristic(start_state)
+        if self._is_goal(start_state):
+            self.moves = []
+            yield "SOLVED"
+            return
+        if h == unreachable:
+            yield "NO_SOLUTION"
+            return
+        if self._cannot_beat(h):
+            yield "CANNOT_BEAT"
+            return
+
+        # (f, -g, état) : à f égal on développe d'abord les états les plus profonds
+        opened = [(h, 0, start_state)]
+        best_g = {start_state: 0}
+        parents = {start_state: None}
+
+        while opened:
+            yield "CALCULATING"
+
+            f, g, state = heapq.heappop(opened)
+            g = -g
+            if g > best_g[state]:
+                continue  # Entrée périmée, l'état a été retrouvé par un chemin plus court
+            self.nodes_expanded += 1
+            self.lower_bound = f  # h est cohérente : les f dépilés ne font que croître
+            last_move = parents[state][1:] if parents[state] else None
+
+            new_g = g + 1
+            for cell, direction, new_cell, new_state in self._pruned_successors(state, last_move):
+                if new_g < best_g.get(new_state, new_g + 1):
+                    h = heuristic(new_state)
+                    if h == unreachable or self._cannot_beat(new_g + h):
+                        continue  # Le robot de la cible ne peut plus l'atteindre (à temps)
+                    best_g[new_state] = new_g
+                    parents[new_state] = (state, cell, direction, new_cell)
+
+                    # h étant cohérente, un but généré depuis l'état de f minimal est optimal
+                    if h == 0 and self._is_goal(new_state):
+                        self.moves = self._moves_from_path(self._path_to(parents, new_state))
+                        print("Solution optimale trouvée avec les mouvements :", self.moves)
+                        yield "SOLVED"
+                        return
+
+                    heapq.heappush(opened, (new_g + h, -new_g, new_state))
+
+        yield "CANNOT_BEAT" if self.max_length is not None else "NO_SOLUTION"
+
+
+    def _open_lower_bound(self, opened, best_g, heuristic, best_length):
+        """
+        Calcule la borne inférieure de la recherche à tout moment : toute solution plus courte
+        que best_length passe par un état de la file ouverte, et h étant admissible, sa longueur
+        est au moins le plus petit g + h de la file.
+
+        Args:
+            opened (list): File de priorité (g + epsilon * h, -g, état).
+            best_g (dict): Meilleur g connu de chaque état.
+            heuristic (function): Heuristique de la recherche (voir _heuristic).
+            best_length (int): Longueur de la meilleure solution trouvée.
+
+        Returns:
+            int: Borne inférieure sur la longueur optimale.
+        """
+        bound = best_length
+        for _, g, state in opened:
+            g = -g
+            if g == best_g[state]:
+                bound = min(bound, g + heuristic(state))
+        return bound
+
+    def _play_anytime(self):
+        """
+        A* pondéré à tout moment : les états sont développés par g + epsilon * h, ce qui donne
+        vite une première solution d'au plus epsilon fois la longueur optimale. La recherche
+        continue ensuite en écartant les états qui ne peuvent pas faire mieux (g + h au moins
+        égal à la meilleure longueur) et annonce chaque solution plus courte par "IMPROVED".
+        La meilleure solution est toujours dans self.best_moves, et self.suboptimality donne le
+        rapport prouvé entre sa longueur et l'optimum, qui se resserre au fil de la recherche.
+        Quand la file est vide la solution est optimale. Avec self.max_length, la recherche
+        part comme si une solution de max_length + 1 coups était déjà connue.
+
+        Yields:
+            str: "CALCULATING", "IMPROVED", "SOLVED", "NO_SOLUTION" ou "CANNOT_BEAT".
+        """
+        self.best_moves = None
+        self.suboptimality = None
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+        yield from self._load_pattern_database()
+        heuristic = self._heuristic()
+        unreachable = self.board.UNREACHABLE
+        epsilon = self.epsilon
+
+        h = heuristic(start_state)
+        if self._is_goal(start_state):
+            self.moves = []
+            self.suboptimality = 1.0
+            yield "SOLVED"
+            return
+        if h == unreachable:
+            yield "NO_SOLUTION"
+            return
+
+        # (g + epsilon * h, -g, état)
+        opened = [(epsilon * h, 0, start_state)]
+        best_g = {start_state: 0}
+        parents = {start_state: None}
+        best_length = None
+        # Longueur à battre : celle de la meilleure solution, ou la limite de l'adversaire
+        limit = self.max_length + 1 if self.max_length is not None else None
+        self.lower_bound = h
+
+        while opened:
+            yield "CALCULATING"
+
+            _, g, state = heapq.heappop(opened)
+            g = -g
+            if g > best_g[state]:
+                continue  # Entrée périmée, l'état a été retrouvé par un chemin plus court
+            if limit is not None and g + heuristic(state) >= limit:
+                continue  # Ne peut pas mener à une solution plus courte
+            self.nodes_expanded += 1
+
+            # La borne est coûteuse à recalculer (parcours de la file) : de temps en temps seulement
+            if best_length is not None and self.nodes_expanded % 4096 == 0:
+                self.lower_bound = max(self.lower_bound, self._open_lower_bound(opened, best_g, heuristic, best_length))
+                self.suboptimality = best_length / self.lower_bound
+
+            last_move = parents[state][1:] if parents[state] else None
+            new_g = g + 1
+            for cell, direction, new_cell, new_state in self._pruned_successors(state, last_move):
+                if new_g < best_g.get(new_state, new_g + 1):
+                    h = heuristic(new_state)
+                    if h == unreachable or (limit is not None and new_g + h >= limit):
+                        continue
+                    best_g[new_state] = new_g
+                    parents[new_state] = (state, cell, direction, new_cell)
+
+                    if h == 0 and self._is_goal(new_state):
+                        best_length = limit = new_g
+                        self.best_moves = self._moves_from_path(self._path_to(parents, new_state))
+                        self.moves = list(self.best_moves)
+
+                        # L'état en cours de développement n'est plus dans la file : on en tient compte
+                        bound = min(self._open_lower_bound(opened, best_g, heuristic, best_length),
+                                    g + heuristic(state))
+                        self.lower_bound = max(self.lower_bound, bound)
+                        self.suboptimality = best_length / self.lower_bound
+                        print(f"Solution en {best_length} coups, au plus {self.suboptimality:.2f} fois l'optimum")
+                        yield "IMPROVED"
+                        continue
+
+                    heapq.heappush(opened, (new_g + epsilon * h, -new_g, new_state))
+
+        if best_length is None:
+            yield "CANNOT_BEAT" if self.max_length is not None else "NO_SOLUTION"
+            return
+
+        # File vide : aucune solution plus courte n'existe
+        self.lower_bound = best_length
+        self.suboptimality = 1.0
+        self.moves = list(self.best_moves)
+        print("Solution optimale trouvée avec les mouvements :", self.moves)
+        yield "SOLVED"
+
+
+class TranspositionTable:
+    def __init__(self, size_bits):
+        """
+        Table de transposition de taille fixe (2 ** size_bits entrées) pour IDA*. Chaque entrée
+        garde un état, la profondeur g à laquelle il a été développé et le numéro d'itération.
+        En cas de collision la nouvelle entrée remplace l'ancienne : la mémoire reste constante,
+        une entrée perdue coûte seulement une nouvelle exploration.
+
+        Args:
+            size_bits (int): Logarithme en base 2 du nombre d'entrées.
+        """
+        self.size_bits = size_bits
+        self.mask = (1 << size_bits) - 1
+        self.states = array("Q", [0]) * (1 << size_bits)  # état + 1, 0 pour une entrée vide
+        self.depths = array("H", [0]) * (1 << size_bits)  # Profondeurs jusqu'à 65535
+        self.iterations = array("I", [0]) * (1 << size_bits)
+
+    def _index(self, state):
+        return mix64(state) >> (64 - self.size_bits)
+
+    def seen(self, state, depth, iteration):
+        """
+        Vérifie si l'état a déjà été développé pendant cette itération à une profondeur
+        inférieure ou égale, auquel cas son sous-arbre a déjà été exploré.
+
+        Args:
+            state (int): L'état compacté.
+            depth (int): Profondeur à laquelle on rencontre l'état.
+            iteration (int): Numéro de l'itération en cours.
+
+        Returns:
+            bool: True si l'état peut être ignoré.
+        """
+        index = self._index(state)
+        return (self.states[index] == state + 1 and self.iterations[index] == iteration
+                and self.depths[index] <= depth)
+
+    def store(self, state, depth, iteration):
+        """
+        Enregistre un état développé, en remplaçant l'entrée précédente.
+
+        Args:
+            state (int): L'état compacté.
+            depth (int): Profondeur à laquelle l'état est développé.
+            iteration (int): Numéro de l'itération en cours.
+        """
+        index = self._index(state)
+        self.states[index] = state + 1
+        self.depths[index] = depth
+        self.iterations[index] = iteration
+
+    def memory_usage(self):
+        """
+        Renvoie la mémoire occupée par les tableaux de la table.
+
+        Returns:
+            int: Taille en octets.
+        """
+        return sum(a.itemsize * len(a) for a in (self.states, self.depths, self.iterations))
+
+
+class IDAStarPlayer(Player):
+    def __init__(self, name, canonical=False, table_bits=20, budget=None):
+        """
+        Initialise un joueur utilisant IDA* (A* à approfondissement itératif) avec la carte de
+        distance comme borne inférieure. Contrairement à BFS et A*, la mémoire ne dépend pas de
+        la profondeur de la solution : seule la table de transposition, de taille fixe, est gardée.
+
+        Args:
+            name (str): Nom du joueur.
+            canonical (bool): Si True, les robots bloqueurs sont considérés interchangeables.
+            table_bits (int): Logarithme en base 2 du nombre d'entrées de la table de transposition.
+            budget (SearchBudget, optional): Limites de la recherche (voir Player.solve).
+        """
+        super().__init__(name)
+        self.exact = True
+        self.canonical = canonical
+        self.table_bits = table_bits
+        self.budget = budget
+
+    def play(self):
+        """
+        Exécute IDA* pour trouver une solution optimale.
+
+        Yields:
+            str: "CALCULATING" lorsque l'algorithme est en cours.
+            str: "SOLVED" si une solution est trouvée.
+            str: "NO_SOLUTION" si aucune solution n'est trouvée.
+            str: "CANNOT_BEAT" si aucune solution n'a au plus self.max_length coups.
+        """
+        start_state = self._start_search()
+        if start_state is None:
+            yield "NO_SOLUTION"
+            return
+        distances = self.board.distance_map(self._target_cell)
+        unreachable = self.board.UNREACHABLE
+        cell_mask = self._cell_mask
+
+        bound = distances[start_state & cell_mask]  # Accessible : vérifié par _start_search
+        if self._is_goal(start_state):
+            self.moves = []
+            yield "SOLVED"
+            return
+
+        table = TranspositionTable(self.table_bits)
+        iteration = 0
+
+        while True:
+            iteration += 1
+            self.lower_bound = bound
+            if self._cannot_beat(bound):
+                print(f"IDA* : aucune solution en {self.max_length} coups ou moins")
+                yield "CANNOT_BEAT"
+                return
+            next_bound = None  # Plus petit f dépassant la borne, pour l'itération suivante
+            table.store(start_state, 0, iteration)
+
+            # Parcours en profondeur itératif : la pile contient les états du chemin courant
+            # avec leur générateur de successeurs, path les déplacements correspondants
+            stack = [(start_state, self._pruned_successors(start_state, None))]
+            path = []
+
+            while stack:
+                state, children = stack[-1]
+                depth = len(stack)  # Profondeur des enfants
+
+                for cell, direction, new_cell, new_state in children:
+                    h = distances[new_state & cell_mask]
+                    if h == unreachable or table.seen(new_state, depth, iteration):
+                        continue
+
+                    f = depth + h
+                    if f > bound:
+                        if next_bound is None or f < next_bound:
+                            next_bound = f
+                        continue
+
+                    if self._is_goal(new_state):
+                        path.append((cell, direction, new_cell))
+                        self.moves = self._moves_from_path(path)
+                        print("Solution optimale trouvée avec les mouvements :", self.moves)
+                        yield "SOLVED"
+                        return
+
+                    table.store(new_state, depth, iteration)
+                    self.nodes_expanded += 1
+                    path.append((cell, direction, new_cell))
+                    stack.append((new_state, self._pruned_successors(new_state, path[-1])))
+                    yield "CALCULATING"
+                    break
+                else:
+                    # Tous les successeurs ont été vus, on remonte
+                    stack.pop()
+                    if path:
+                        path.pop()
+
+            if next_bound is None:
+                yield "NO_SOLUTION"
+                return
+            print(f"IDA* : pas de solution en {bound} coups, nouvelle borne {next_bound}")
+            bound = next_bound
@@ -0,0 +1,226 @@
+import copy
+import multiprocessing
+import queue
+
+from player import AStartPlayer, BFSPlayer, IDAStarPlayer, Player
+from shared_board import SharedBoard, SharedBoardTables
+
+# Moteurs lancés par défaut : (nom, classe du joueur, arguments). Tous donnent une solution
+# optimale, la première réponse est donc aussi la meilleure.
+DEFAULT_ENGINES = (
+    ("BFS", BFSPlayer, {}),
+    ("A* optimal", AStartPlayer, {"optimal": True}),
+    ("IDA*", IDAStarPlayer, {}),
+)
+
+
+def _run_engine(index, engine_class, engine_kwargs, budget, max_length, tables, robots, targets, target_index,
+                results):
+    """
+    Résout la cible actuelle avec un moteur, dans son propre processus, et envoie le résultat.
+
+    Args:
+        index (int): Indice du moteur dans le portefeuille.
+        engine_class (type): Classe du joueur IA.
+        engine_kwargs (dict): Arguments du joueur IA.
+        budget (SearchBudget): Limites de la recherche du moteur, ou None.
+        max_length (int): Longueur maximale utile d'une solution, ou None.
+        tables (tuple): SharedBoardTables.handle des tableaux du plateau.
+        robots (list): Robots du plateau.
+        targets (list): Cibles du plateau.
+        target_index (int): Indice de la cible actuelle.
+        results (Queue): File où envoyer (indice, résultat, mouvements, états développés,
+            borne inférieure).
+    """
+    board = SharedBoard.attach(tables, robots, targets, target_index)
+    engine = engine_class("portfolio", **engine_kwargs)
+    engine.set_board(board)
+    engine.budget = budget
+    engine.max_length = max_length
+
+    result = None
+    for result in engine.solve():
+        if result != "CALCULATING":
+            break
+    results.put((index, result, list(engine.moves), engine.nodes_expanded, engine.lower_bound))
+    board.close()
+
+
+class PortfolioPlayer(Player):
+    def __init__(self, name, engines=DEFAULT_ENGINES, in_process=False, budget=None):
+        """
+        Initialise un joueur qui fait la course entre plusieurs moteurs de recherche, chacun
+        dans son processus, sur le même plateau et la même cible. La première solution valide
+        est gardée et les autres moteurs sont arrêtés.
+
+        Args:
+            name (str): Nom du joueur.
+            engines (tuple): Moteurs à lancer, sous la forme (nom, classe du joueur, arguments).
+            in_process (bool): Si True, les moteurs avancent à tour de rôle dans le processus
+                courant (par exemple dans un processus démon, qui ne peut pas en lancer d'autres).
+            budget (SearchBudget, optional): Limites de la course (voir Player.solve). La durée
+                s'applique à la course entière, les limites d'états et de mémoire à chaque moteur.
+        """
+        super().__init__(name)
+        # La première solution gardée est optimale si tous les moteurs sont exacts
+        self.exact = all(engine_class(name, **engine_kwargs).exact for _, engine_class, engine_kwargs in engines)
+        self.engines = engines
+        self.in_process = in_process
+        self.budget = budget
+        self.winner = None
+
+    def _is_valid(self, moves):
+        """
+        Rejoue une solution sur le plateau pour vérifier qu'elle est légale et atteint la cible.
+
+        Args:
+            moves (list): Mouvements (couleur, direction, position).
+
+        Returns:
+            bool: True si la solution est valide.
+        """
+        cells = dict(zip(self._colors, self._start_cells))
+        direction_indices = {name: d for d, (name, _, _, _, _) in enumerate(self.board.DIRECTIONS)}
+        for color, direction, position in moves:
+            if color not in cells or direction not in direction_indices:
+                return False
+            occupancy = self.board.occupancy(cells.values())
+            stop = self.board.slide(cells[color], direction_indices[direction], occupancy)
+            if stop == cells[color] or stop != self.board.cell_index(position):
+                return False
+            cells[color] = stop
+        return cells[self._colors[0]] == self._target_cell
+
+    def _race_processes(self):
+        """
+        Lance chaque moteur dans son processus et relaie leurs résultats.
+
+        Yields:
+            tuple: (indice, résultat, mouvements, états développés, borne inférieure) de chaque
+            moteur qui termine, ou None en attendant.
+        """
+        tables = SharedBoardTables(self.board)
+        results = multiprocessing.Queue()
+        processes = []
+        try:
+            for index, (_, engine_class, engine_kwargs) in enumerate(self.engines):
+                process = multiprocessing.Process(
+                    target=_run_engine,
+                    args=(index, engine_class, engine_kwargs, self.budget, self.max_length, tables.handle,
+                          self.board.robots, self.board.targets, self.board.current_target_index, results),
+                    daemon=True,
+                )
+                process.start()
+                processes.append(process)
+
+            finished = 0
+            while finished < len(processes):
+                yield None
+                try:
+                    outcome = results.get(timeout=0.01)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes) and results.empty():
+                        return  # Tous les moteurs se sont arrêtés sans répondre
+                    continue
+                finished += 1
+                yield outcome
+        finally:
+            # Les moteurs encore en cours sont annulés
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+            results.close()
+            tables.close()
+
+    def _race_in_process(self):
+        """
+        Fait avancer les moteurs à tour de rôle, d'une étape de calcul chacun, dans le processus
+        courant.
+
+        Yields:
+            tuple: Comme _race_processes.
+        """
+        searches = []
+        for index, (_, engine_class, engine_kwargs) in enumerate(self.engines):
+            engine = engine_class("portfolio", **engine_kwargs)
+            engine.set_board(self.board)
+            engine.budget = copy.copy(self.budget)  # Chaque moteur a son propre chronomètre
+            engine.max_length = self.max_length
+            searches.append((index, engine, engine.solve()))
+
+        try:
+            while searches:
+                yield None
+                for search in list(searches):
+                    index, engine, steps = search
+                    result = next(steps, None)
+                    if result in ("CALCULATING", "IMPROVED"):
+                        continue
+                    searches.remove(search)
+                    yield index, result, list(engine.moves), engine.nodes_expanded, engine.lower_bound
+        finally:
+            # Les moteurs encore en cours sont annulés
+            for _, _, steps in searches:
+                steps.close()
+
+    def play(self):
+        """
+        Lance tous les moteurs et attend la première solution valide.
+
+        Yields:
+            str: "CALCULATING" lorsque les moteurs sont en cours de calcul.
+            str: "SOLVED" si une solution est trouvée (le moteur gagnant est dans self.winner).
+            str: "NO_SOLUTION" si aucun moteur ne trouve de solution.
+            str: "BUDGET_EXCEEDED" si aucun moteur n'a trouvé de solution et qu'au moins un a
+            dépassé son budget.
+            str: "CANNOT_BEAT" si un moteur prouve qu'aucune solution n'a au plus
+            self.max_length coups.
+        """
+        self.winner = None
+        if self._start_search() is None:
+            yield "NO_SOLUTION"
+            return
+
+        race = self._race_in_process() if self.in_process else self._race_processes()
+        exceeded = False
+        try:
+            for outcome in race:
+                if outcome is None:
+                    yield "CALCULATING"
+                    continue
+
+                index, result, moves, nodes, lower_bound = outcome
+                self.nodes_expanded += nodes
+                self.lower_bound = max(self.lower_bound, lower_bound)
+                exceeded = exceeded or result == "BUDGET_EXCEEDED"
+                if result == "SOLVED" and self._is_valid(moves):
+                    self.moves = moves
+                    self.winner = self.engines[index][0]
+                    print(f"Moteur gagnant : {self.winner}")
+                    print("Solution trouvée avec les mouvements :", self.moves)
+                    yield "SOLVED"
+                    return
+                if result == "CANNOT_BEAT":
+                    # Les moteurs sont exacts : aucun autre ne fera mieux
+                    print(f"Moteur {self.engines[index][0]} : aucune solution en {self.max_length} coups ou moins.")
+                    yield "CANNOT_BEAT"
+                    return
+        finally:
+            race.close()
+
+        if exceeded:
+            # La recherche n'est pas terminée : on ne peut pas conclure qu'il n'y a pas de solution
+            self.search_report = {
+                "reason": "engines",
+                "elapsed": self.budget.elapsed(),
+                "nodes": self.nodes_expanded,
+                "memory": None,
+                "lower_bound": self.lower_bound,
+            }
+            print("Tous les moteurs ont dépassé leur budget.")
+            yield "BUDGET_EXCEEDED"
+            return
+
+        print("Aucune solution trouvée.")
+        yield "NO_SOLUTION"
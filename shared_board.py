@@ -0,0 +1,105 @@
+from multiprocessing import shared_memory
+
+from board import Board
+
+
+class SharedBoardTables:
+    """
+    Copie les tableaux compilés d'un plateau (murs, centre et table des arrêts) dans un bloc
+    de mémoire partagée. Les processus de calcul s'y attachent par son nom avec
+    SharedBoard.attach, sans copie ni sérialisation du plateau.
+
+    Disposition du bloc : wall_masks (une case par octet), center_mask, puis stop_table.
+    """
+
+    def __init__(self, board):
+        """
+        Args:
+            board (Board): Le plateau dont on exporte les tableaux.
+        """
+        self.board_size = board.BOARD_SIZE
+        tables = (board.wall_masks, board.center_mask, board.stop_table.tobytes())
+        self.memory = shared_memory.SharedMemory(create=True, size=sum(len(t) for t in tables))
+
+        offset = 0
+        for table in tables:
+            self.memory.buf[offset:offset + len(table)] = table
+            offset += len(table)
+
+    @property
+    def handle(self):
+        """
+        Renvoie ce qu'il faut transmettre à un processus pour qu'il s'attache au bloc.
+
+        Returns:
+            tuple: (nom du bloc, taille du plateau).
+        """
+        return self.memory.name, self.board_size
+
+    def close(self):
+        """
+        Détache le bloc de ce processus et le détruit : à appeler une fois que plus aucun
+        processus de calcul ne l'utilise.
+        """
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SharedBoard(Board):
+    """
+    Plateau reconstruit dans un processus de calcul à partir d'un bloc de mémoire partagée :
+    ses tableaux sont des vues sur le bloc, et seuls les robots et les cibles (quelques
+    dictionnaires) sont transmis au processus. Il n'a pas de grille de dictionnaires et ne
+    sert donc qu'aux IA (slide, occupancy, distance_map...), pas à l'affichage.
+    """
+
+    @classmethod
+    def attach(cls, handle, robots, targets, current_target_index=0):
+        """
+        S'attache à un bloc créé par SharedBoardTables.
+
+        Args:
+            handle (tuple): SharedBoardTables.handle.
+            robots (list): Robots du plateau (couleur et position).
+            targets (list): Cibles du plateau.
+            current_target_index (int): Indice de la cible actuelle.
+
+        Returns:
+            SharedBoard: Le plateau, à fermer avec close() avant la fin du processus.
+        """
+        name, board_size = handle
+        board = cls.__new__(cls)
+        board.memory = shared_memory.SharedMemory(name=name)
+
+        cells = board_size * board_size
+        view = board.memory.buf
+        board.BOARD_SIZE = board_size
+        board.wall_masks = view[:cells]
+        board.center_mask = view[cells:2 * cells]
+        # Même type d'éléments que Board._compute_stop_table (le bloc peut être arrondi à une
+        # taille de page, on ne garde que la longueur utile)
+        typecode = "B" if cells <= 256 else "H"
+        stop_bytes = cells * len(cls.DIRECTIONS) * (1 if typecode == "B" else 2)
+        board.stop_table = view[2 * cells:2 * cells + stop_bytes].cast(typecode)
+        board.distance_maps = {}
+        board._precomputation = None
+
+        board.robots = robots
+        board.targets = targets
+        board.current_target_index = current_target_index
+        return board
+
+    def close(self):
+        """
+        Détache le plateau du bloc partagé (le bloc lui-même reste en place).
+        """
+        # Les vues doivent être libérées avant de pouvoir fermer le bloc
+        for table in (self.wall_masks, self.center_mask, self.stop_table):
+            table.release()
+        self.memory.close()
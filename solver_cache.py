@@ -0,0 +1,195 @@
+import collections
+import hashlib
+import json
+import os
+
+import pattern_database
+
+# Dossier des solutions gardées d'une exécution à l'autre
+CACHE_DIR = os.path.join(pattern_database.CACHE_DIR, "solutions")
+
+
+def problem_key(layout_key, robots, target, engine):
+    """
+    Calcule la clé d'un problème pour un moteur.
+
+    Args:
+        layout_key (str): Empreinte de la disposition des murs (Board.layout_key).
+        robots (list): Robots (couleur et position).
+        target (dict): La cible (couleur et position).
+        engine (str): Identifiant du moteur de recherche.
+
+    Returns:
+        str: La clé (empreinte hexadécimale).
+    """
+    robots = sorted((robot["color"], tuple(robot["position"])) for robot in robots)
+    description = repr((layout_key, robots, target["color"], tuple(target["position"]), engine))
+    return hashlib.sha1(description.encode()).hexdigest()
+
+
+class SolverCache:
+    """
+    Cache des solutions des IA, à deux niveaux : les solutions récentes en mémoire (LRU), et
+    toutes les solutions sur le disque (un petit fichier JSON par problème) jusqu'à une taille
+    maximale, au-delà de laquelle les fichiers les moins récemment utilisés sont supprimés.
+
+    Un problème est identifié par la disposition des murs, les positions des robots, la cible
+    et le moteur de recherche : deux IA identiques partagent donc leurs solutions. Chaque
+    solution garde aussi si elle est prouvée optimale (moteur exact, recherche menée à son
+    terme) : une telle solution trop longue prouve qu'on ne peut pas faire mieux.
+    """
+
+    def __init__(self, capacity=256, cache_dir=CACHE_DIR, max_disk_bytes=16 * 1024 * 1024):
+        """
+        Args:
+            capacity (int): Nombre de solutions gardées en mémoire.
+            cache_dir (str): Dossier des solutions sur le disque, ou None pour le cache en
+                mémoire seulement.
+            max_disk_bytes (int): Taille maximale des fichiers du dossier, en octets.
+        """
+        self.capacity = capacity
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = collections.OrderedDict()  # Clé -> (mouvements, optimale), du moins au plus récent
+        self.hits = 0
+        self.disk_hits = 0  # Parmi les succès, ceux lus sur le disque
+        self.misses = 0
+
+    def key(self, board, engine):
+        """
+        Calcule la clé du problème actuel du plateau pour un moteur.
+
+        Args:
+            board (Board): Le plateau.
+            engine (str): Identifiant du moteur de recherche.
+
+        Returns:
+            str: La clé (empreinte hexadécimale).
+        """
+        return problem_key(board.layout_key(), board.robots, board.get_current_target(), engine)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Cherche une solution en mémoire puis sur le disque.
+
+        Args:
+            key (str): Clé du problème.
+
+        Returns:
+            tuple: (mouvements (couleur, direction, position), True si la solution est prouvée
+            optimale, True si elle a été lue sur le disque), ou (None, False, False) si le
+            problème est inconnu.
+        """
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            moves, optimal = self.memory[key]
+            return moves, optimal, False
+        if self.cache_dir is None:
+            return None, False, False
+
+        try:
+            with open(self._path(key)) as file:
+                entry = json.load(file)
+            moves = [(color, direction, tuple(position)) for color, direction, position in entry["moves"]]
+            optimal = bool(entry["optimal"])
+        except (OSError, ValueError, TypeError, KeyError):
+            return None, False, False  # Absent ou illisible : on résoudra à nouveau
+        os.utime(self._path(key))  # La date de modification sert d'ordre LRU sur le disque
+        self._remember(key, moves, optimal)
+        return moves, optimal, True
+
+    def put(self, key, moves, optimal=False):
+        """
+        Enregistre une solution en mémoire et sur le disque.
+
+        Args:
+            key (str): Clé du problème.
+            moves (list): Mouvements (couleur, direction, position).
+            optimal (bool): True si la solution est prouvée de longueur minimale.
+        """
+        moves = list(moves)
+        self._remember(key, moves, optimal)
+        if self.cache_dir is None:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        # Écriture atomique : un fichier présent est toujours complet
+        with open(path + ".tmp", "w") as file:
+            json.dump({"moves": moves, "optimal": optimal}, file)
+        os.replace(path + ".tmp", path)
+        self._evict_disk()
+
+    def _remember(self, key, moves, optimal):
+        self.memory[key] = (moves, optimal)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """
+        Supprime les solutions les moins récemment utilisées tant que le dossier dépasse sa
+        taille maximale.
+        """
+        files = []
+        total = 0
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def solve(self, player, engine):
+        """
+        Enveloppe Player.solve : une solution connue est rendue immédiatement, sinon le joueur
+        cherche et sa solution est enregistrée. Seules les recherches menées à leur terme sont
+        gardées (pas la meilleure solution d'une recherche arrêtée par son budget). Une solution
+        optimale plus longue que player.max_length répond directement "CANNOT_BEAT" : c'est le
+        cas du second joueur d'un tour qui a le même moteur exact que le premier.
+
+        Args:
+            player (Player): Le joueur IA, avec son plateau.
+            engine (str): Identifiant du moteur de recherche du joueur.
+
+        Yields:
+            str: Les résultats de player.solve(), ou "SOLVED" (ou "CANNOT_BEAT") directement en
+            cas de succès.
+        """
+        key = self.key(player.board, engine)
+        moves, optimal, from_disk = self.get(key)
+        result = None
+        if moves is not None:
+            if player.max_length is None or len(moves) <= player.max_length:
+                result = "SOLVED"
+            elif optimal:
+                result = "CANNOT_BEAT"  # Aucune solution n'est plus courte
+            # Sinon la solution est trop longue pour battre l'adversaire : le joueur cherche mieux
+        if result is not None:
+            self.hits += 1
+            if from_disk:
+                self.disk_hits += 1
+            player.moves = list(moves)
+            player.nodes_expanded = 0
+            player.search_report = None
+            print(f"Solution en {len(moves)} coups dans le cache ({self.hits} succès, {self.misses} échecs)")
+            yield result
+            return
+
+        self.misses += 1
+        for result in player.solve():
+            if result == "SOLVED" and player.search_report is None:
+                self.put(key, player.moves, optimal=player.exact)
+            yield result
@@ -0,0 +1,260 @@
+import atexit
+import copy
+import math
+import multiprocessing
+import queue
+import time
+
+from budget import SearchBudget
+from shared_board import SharedBoard, SharedBoardTables
+from solver_cache import problem_key
+
+
+def _speculate(key, create_player, engine, tables, robots, targets, target_index, results, cancelled, deadline):
+    """
+    Résout à l'avance une cible depuis une configuration de robots, dans son propre processus,
+    et envoie le résultat.
+
+    Args:
+        key (str): Clé du problème (voir solver_cache.problem_key).
+        create_player (function): Fonction (type d'IA, nom, in_process) -> joueur IA.
+        engine (str): Type d'IA.
+        tables (tuple): SharedBoardTables.handle des tableaux du plateau.
+        robots (list): Configuration des robots.
+        targets (list): Cibles du plateau.
+        target_index (int): Indice de la cible à résoudre.
+        results (Queue): File où envoyer (clé, résultat final, mouvements, True si la solution est
+            prouvée optimale, compte rendu de la recherche (voir Player.solve)).
+        cancelled (Event): Positionné pour arrêter la recherche.
+        deadline (Value): Heure (time.time()) à laquelle le budget du joueur qui attend cette
+            recherche est épuisé, infinie tant que personne ne l'attend.
+    """
+    board = SharedBoard.attach(tables, robots, targets, target_index)
+    # Un processus démon ne peut pas lancer d'autres processus : le joueur calcule sur place
+    player = create_player(engine, "speculation", in_process=True)
+    player.set_board(board)
+    if player.budget is None:
+        player.budget = SearchBudget()
+    time_limit = player.budget.time_limit
+
+    result = None
+    waited = False
+    for result in player.solve():
+        if cancelled.is_set():
+            player.cancel()  # La recherche s'arrête à sa prochaine étape avec "CANCELLED"
+        elif not waited and deadline.value < math.inf:
+            # Un joueur attend la recherche : elle ne dépasse pas ce qui reste de son budget
+            waited = True
+            remaining = player.budget.elapsed() + deadline.value - time.time()
+            player.budget.time_limit = remaining if time_limit is None else min(time_limit, remaining)
+        if result not in ("CALCULATING", "IMPROVED"):
+            break
+    results.put((key, result, list(player.moves), player.exact, player.search_report))
+    board.close()
+
+
+class Speculation:
+    """
+    Résolution spéculative de la cible suivante : dès qu'une configuration de fin de tour est
+    connue (celle d'un joueur qui vient de trouver), les IA commencent à chercher la cible
+    suivante depuis cette configuration dans d'autres processus. Quand le tour est tranché,
+    seules les recherches partant de la configuration du gagnant sont gardées.
+
+    Une recherche spéculative tient lieu de recherche du joueur : l'attente est comptée dans
+    son budget, et une recherche arrêtée par son budget est le résultat du tour (elle n'est
+    pas recommencée).
+    """
+
+    def __init__(self, create_player):
+        """
+        Args:
+            create_player (function): Fonction (type d'IA, nom, in_process) -> joueur IA,
+                appelée dans les processus de recherche avec in_process=True.
+        """
+        self.create_player = create_player
+        self.results = multiprocessing.Queue()
+        self.running = {}  # Clé -> (processus, événement d'annulation, heure limite partagée)
+        # Clé -> (résultat, mouvements, optimale, compte rendu) des recherches terminées
+        self.solutions = {}
+        self._tables = None
+        # Les recherches en cours ne doivent pas retarder la fin du programme
+        atexit.register(self.close)
+
+    def start(self, board, robots, target_index, engines):
+        """
+        Lance la recherche de la cible target_index depuis une configuration, pour chaque type
+        d'IA (une seule fois par problème).
+
+        Args:
+            board (Board): Le plateau.
+            robots (list): Configuration des robots de départ.
+            target_index (int): Indice de la cible.
+            engines (set): Types d'IA des joueurs.
+        """
+        if not engines:
+            return
+        if self._tables is None:
+            self._tables = SharedBoardTables(board)  # Les murs ne changent pas de la partie
+        robots = copy.deepcopy(robots)
+        for engine in engines:
+            key = problem_key(board.layout_key(), robots, board.targets[target_index], engine)
+            if key in self.running or key in self.solutions:
+                continue
+            cancelled = multiprocessing.Event()
+            deadline = multiprocessing.RawValue("d", math.inf)
+            # Processus démon : une recherche bloquée n'empêche pas le jeu de se fermer
+            process = multiprocessing.Process(
+                target=_speculate,
+                args=(key, self.create_player, engine, self._tables.handle, robots, board.targets, target_index,
+                      self.results, cancelled, deadline),
+                daemon=True,
+            )
+            process.start()
+            self.running[key] = (process, cancelled, deadline)
+
+    def _collect(self, timeout=0):
+        """
+        Récupère les résultats des recherches terminées.
+
+        Args:
+            timeout (float): Durée maximale d'attente d'un premier résultat, en secondes.
+        """
+        # Un processus arrêté a déjà envoyé son résultat s'il en avait un
+        stopped = [key for key, (process, _, _) in self.running.items() if not process.is_alive()]
+        while True:
+            try:
+                key, *outcome = self.results.get(timeout=timeout) if timeout else self.results.get_nowait()
+            except queue.Empty:
+                break
+            timeout = 0
+            if key in self.running:  # Sinon la recherche a été abandonnée entre-temps
+                self.running.pop(key)[0].join()
+                self.solutions[key] = tuple(outcome)
+        for key in stopped:
+            if key in self.running:  # Processus arrêté sans résultat (erreur)
+                self.running.pop(key)[0].join()
+                self.solutions[key] = (None, [], False, None)
+
+    def _stop(self, key):
+        """
+        Arrête une recherche : elle s'arrête d'elle-même à sa prochaine étape de calcul, et au
+        besoin le processus est tué (il n'a pas de processus enfants qui resteraient orphelins).
+
+        Args:
+            key (str): Clé du problème.
+        """
+        process, cancelled, _ = self.running.pop(key)
+        cancelled.set()
+        process.join(1)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+    def resolve(self, board, engines, cache):
+        """
+        À appeler quand le tour est tranché et que le plateau a la configuration du gagnant et
+        la cible suivante : les solutions depuis cette configuration vont dans le cache, les
+        autres recherches sont abandonnées.
+
+        Args:
+            board (Board): Le plateau.
+            engines (set): Types d'IA des joueurs.
+            cache (SolverCache): Cache des solutions.
+        """
+        self._collect()
+        wanted = {cache.key(board, engine) for engine in engines}
+        solutions = self.solutions
+        self.solutions = {}
+        for key, (result, moves, optimal, report) in solutions.items():
+            if key not in wanted:
+                continue
+            if result == "SOLVED" and report is None:
+                cache.put(key, moves, optimal)
+            else:
+                self.solutions[key] = (result, moves, optimal, report)  # Résultat du tour (voir solve)
+        for key in list(self.running):
+            if key not in wanted:
+                self._stop(key)
+
+    def solve(self, player, engine, cache):
+        """
+        Enveloppe SolverCache.solve : si une recherche spéculative du même problème est en
+        cours, on attend sa fin plutôt que de recommencer. L'attente est comptée dans le budget
+        du joueur, qui est aussi transmis à la recherche.
+
+        Args:
+            player (Player): Le joueur IA, avec son plateau.
+            engine (str): Type d'IA du joueur.
+            cache (SolverCache): Cache des solutions.
+
+        Yields:
+            str: "CALCULATING" pendant l'attente, puis les résultats de cache.solve() ou ceux
+            de la recherche spéculative si elle n'a pas abouti, "BUDGET_EXCEEDED" si le budget
+            du joueur est épuisé pendant l'attente, ou "CANCELLED" si player.cancel() est appelé
+            pendant l'attente.
+        """
+        key = cache.key(player.board, engine)
+        player.cancel_requested = False
+        budget = player.budget
+        if key in self.running and budget is not None:
+            budget.start()
+            if budget.time_limit is not None:
+                self.running[key][2].value = time.time() + budget.time_limit
+        while key in self.running:
+            if player.cancel_requested:
+                self._stop(key)
+                yield "CANCELLED"
+                return
+            reason = budget.exceeded(0) if budget is not None else None
+            if reason:
+                # La recherche a la même limite : on lui laisse le temps de rendre son compte rendu
+                self._collect(timeout=0.1)
+                if key in self.running:
+                    self._stop(key)
+                    player.moves = []
+                    player.nodes_expanded = 0
+                    player.search_report = {
+                        "reason": reason,
+                        "elapsed": budget.elapsed(),
+                        "nodes": 0,
+                        "memory": budget.memory,
+                        "lower_bound": 0,
+                    }
+                    yield "BUDGET_EXCEEDED"
+                    return
+                break
+            yield "CALCULATING"
+            self._collect(timeout=0.01)
+
+        result, moves, optimal, report = self.solutions.pop(key, (None, [], False, None))
+        if result == "SOLVED" and report is None:
+            cache.put(key, moves, optimal)
+        elif result == "NO_SOLUTION":
+            player.moves = []
+            player.search_report = None
+            yield "NO_SOLUTION"
+            return
+        elif report is not None and report["reason"] != "cancelled":
+            # Recherche arrêtée par son budget : c'est le résultat du tour
+            player.search_report = report
+            player.nodes_expanded = report["nodes"]
+            player.lower_bound = report["lower_bound"]
+            if result == "SOLVED" and (player.max_length is None or len(moves) <= player.max_length):
+                player.moves = moves  # Meilleure solution d'une recherche à tout moment
+                yield "SOLVED"
+            else:
+                player.moves = []
+                yield "BUDGET_EXCEEDED"
+            return
+        yield from cache.solve(player, engine)
+
+    def close(self):
+        """
+        Arrête les recherches en cours et libère le plateau partagé.
+        """
+        for key in list(self.running):
+            self._stop(key)
+        self.solutions.clear()
+        if self._tables is not None:
+            self._tables.close()
+            self._tables = None
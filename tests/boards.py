@@ -0,0 +1,77 @@
+import copy
+import random
+
+from board import Board
+
+COLORS = ["Re", "Bl", "Gr", "Ye"]
+CENTER = {(7, 7), (7, 8), (8, 7), (8, 8)}
+
+
+def random_configuration(rng, board_size=10, num_walls=12, num_robots=4):
+    """
+    Génère une petite configuration aléatoire (une seule cible, de la couleur du premier robot).
+
+    Args:
+        rng (random.Random): Générateur aléatoire.
+        board_size (int): Taille du plateau (au moins 9, le centre est fixe).
+        num_walls (int): Nombre de murs.
+        num_robots (int): Nombre de robots.
+
+    Returns:
+        dict: Configuration avec murs, robots et cible.
+    """
+    cells = [(y, x) for y in range(board_size) for x in range(board_size) if (y, x) not in CENTER]
+    positions = rng.sample(cells, num_robots + 1)
+    return {
+        "walls": [(rng.randrange(board_size), rng.randrange(board_size), rng.choice("TBLR"))
+                  for _ in range(num_walls)],
+        "robots": [{"position": position, "color": COLORS[i]} for i, position in enumerate(positions[:-1])],
+        "targets": [{"position": positions[-1], "color": COLORS[0]}],
+    }
+
+
+def is_valid_solution(configuration, board_size, moves):
+    """
+    Rejoue une solution sur un plateau neuf.
+
+    Args:
+        configuration (dict): Configuration de départ.
+        board_size (int): Taille du plateau.
+        moves (list): Mouvements (couleur, direction, position).
+
+    Returns:
+        bool: True si chaque mouvement est légal et la cible est atteinte.
+    """
+    board = Board(copy.deepcopy(configuration), board_size)
+    for color, direction, position in moves:
+        robot = next(robot for robot in board.robots if robot["color"] == color)
+        if not board.moveARobotWithDirection(robot, direction) or tuple(robot["position"]) != tuple(position):
+            return False
+    return board.is_robot_on_current_target()
+
+
+def run(player):
+    """
+    Exécute la recherche d'un joueur jusqu'à son résultat final.
+
+    Args:
+        player (Player): Le joueur IA, avec son plateau.
+
+    Returns:
+        str: Le dernier résultat de player.solve().
+    """
+    result = None
+    for result in player.solve():
+        if result not in ("CALCULATING", "IMPROVED"):
+            break
+    return result
+
+
+def random_boards(seed, count, board_size=10):
+    """
+    Yields:
+        dict: count configurations aléatoires reproductibles.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield random_configuration(rng, board_size)
@@ -0,0 +1,21 @@
+import copy
+
+from board import Board
+from boards import is_valid_solution, random_boards, run
+from mcts import MCTSPlayer
+
+
+def test_batched_rollouts_return_valid_solutions():
+    # Des lots de plusieurs simulations sur de petits plateaux, avec un horizon court pour que
+    # des nœuds soient souvent déclarés sans issue au milieu d'un lot : cela ne doit pas décaler
+    # les résultats des simulations des nœuds suivants
+    solved = 0
+    for configuration in random_boards(seed=22, count=60):
+        board = Board(copy.deepcopy(configuration), 10)
+        player = MCTSPlayer("mcts", rollouts=300, batch_size=64, horizon=5, workers=1)
+        player.set_board(board)
+        result = run(player)
+        if result == "SOLVED":
+            solved += 1
+            assert is_valid_solution(configuration, 10, player.moves)
+    assert solved > 0
@@ -0,0 +1,64 @@
+import copy
+
+import pytest
+
+from board import Board
+from boards import is_valid_solution, random_boards, run
+from configurations import configurations
+from numpy_bfs import NumpyBFSPlayer
+from parallel_bfs import ParallelBFSPlayer
+from player import BFSPlayer, TranspositionTable
+
+
+@pytest.mark.parametrize("visited", ["set", "hash", "bitset"])
+def test_memory_cap_never_reports_no_solution(visited):
+    # Toutes les cibles des configurations sont accessibles : une recherche arrêtée par sa
+    # limite de mémoire ne doit pas conclure qu'il n'y a pas de solution
+    for configuration in configurations:
+        for target_index in range(len(configuration["targets"])):
+            board = Board(copy.deepcopy(configuration), 16)
+            board.current_target_index = target_index
+            player = BFSPlayer("bfs", visited=visited, memory_cap=1 << 14)
+            player.set_board(board)
+
+            result = run(player)
+            assert result in ("SOLVED", "BUDGET_EXCEEDED")
+            if result == "SOLVED":
+                solution_configuration = copy.deepcopy(configuration)
+                solution_configuration["targets"] = [configuration["targets"][target_index]]
+                assert is_valid_solution(solution_configuration, 16, player.moves)
+            else:
+                assert player.search_report["reason"] == "memory"
+
+
+def test_parallel_bfs_counts_expanded_states_like_bfs():
+    # Les successeurs reçus en double par un processus ne sont pas des états développés (avec
+    # un seul processus, les états sont développés dans le même ordre que BFSPlayer)
+    for configuration in random_boards(17, 4):
+        players = [BFSPlayer("bfs"), ParallelBFSPlayer("parallèle", workers=1)]
+        for player in players:
+            player.set_board(Board(copy.deepcopy(configuration), 10))
+            run(player)
+        assert players[0].nodes_expanded == players[1].nodes_expanded
+        assert len(players[0].moves) == len(players[1].moves)
+
+
+@pytest.mark.parametrize("canonical", [False, True])
+def test_numpy_bfs_finds_optimal_solutions(canonical):
+    for configuration in random_boards(17, 4):
+        players = [BFSPlayer("bfs"), NumpyBFSPlayer("numpy", canonical=canonical)]
+        results = []
+        for player in players:
+            player.set_board(Board(copy.deepcopy(configuration), 10))
+            results.append(run(player))
+        assert results[0] == results[1]
+        assert len(players[0].moves) == len(players[1].moves)
+        if results[1] == "SOLVED":
+            assert is_valid_solution(configuration, 10, players[1].moves)
+
+
+def test_transposition_table_keeps_deep_depths():
+    table = TranspositionTable(4)
+    table.store(12345, 300, 1)
+    assert table.seen(12345, 300, 1)
+    assert not table.seen(12345, 299, 1)
@@ -0,0 +1,68 @@
+import copy
+
+import pytest
+
+from board import Board
+from boards import random_boards
+from player import AStartPlayer, BFSPlayer, IDAStarPlayer
+from solver_cache import SolverCache
+
+
+def make_player(engine_class, configuration, max_length=None):
+    player = engine_class("ia") if engine_class is not AStartPlayer else engine_class("ia", optimal=True)
+    player.set_board(Board(copy.deepcopy(configuration), 10))
+    player.max_length = max_length
+    return player
+
+
+def final_result(generator):
+    result = None
+    for result in generator:
+        if result not in ("CALCULATING", "IMPROVED"):
+            break
+    return result
+
+
+def solvable_configuration():
+    # Un petit plateau dont la solution a au moins un coup
+    for configuration in random_boards(7, 50):
+        player = make_player(BFSPlayer, configuration)
+        if final_result(player.solve()) == "SOLVED" and player.moves:
+            return configuration
+
+
+@pytest.mark.parametrize("engine_class", [BFSPlayer, AStartPlayer, IDAStarPlayer])
+def test_second_exact_player_cannot_beat_from_cache(tmp_path, engine_class):
+    # Le second joueur d'un tour doit faire strictement mieux que le premier : avec le même
+    # moteur exact, la solution optimale du cache suffit à prouver qu'il ne peut pas
+    configuration = solvable_configuration()
+    cache = SolverCache(cache_dir=str(tmp_path))
+
+    first = make_player(engine_class, configuration)
+    assert final_result(cache.solve(first, "exact")) == "SOLVED"
+    assert cache.misses == 1
+
+    second = make_player(engine_class, configuration, max_length=len(first.moves) - 1)
+    assert final_result(cache.solve(second, "exact")) == "CANNOT_BEAT"
+    assert second.nodes_expanded == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # L'information est aussi gardée sur le disque
+    reloaded = SolverCache(cache_dir=str(tmp_path))
+    third = make_player(engine_class, configuration, max_length=len(first.moves) - 1)
+    assert final_result(reloaded.solve(third, "exact")) == "CANNOT_BEAT"
+    assert (reloaded.hits, reloaded.disk_hits, reloaded.misses) == (1, 1, 0)
+
+
+def test_inexact_solution_too_long_is_searched_again():
+    configuration = solvable_configuration()
+    cache = SolverCache(cache_dir=None)
+    player = make_player(BFSPlayer, configuration)
+    assert final_result(player.solve()) == "SOLVED"
+    # Solution d'un moteur non exact, plus longue que l'optimum : elle ne prouve rien
+    cache.put(cache.key(player.board, "heuristique"), player.moves + player.moves, optimal=False)
+
+    second = make_player(BFSPlayer, configuration, max_length=len(player.moves))
+    assert final_result(cache.solve(second, "heuristique")) == "SOLVED"
+    assert len(second.moves) == len(player.moves)
+    assert cache.misses == 1
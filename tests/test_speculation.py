@@ -0,0 +1,47 @@
+import copy
+import time
+
+import pytest
+
+from board import Board
+from budget import SearchBudget
+from configurations import configurations
+from player import BFSPlayer
+from solver_cache import SolverCache
+from speculation import Speculation
+
+
+def create_player(engine, name, in_process=False):
+    # Budget propre de la recherche spéculative, plus long que celui du joueur
+    player = BFSPlayer(name, budget=SearchBudget(time_limit=2))
+    player.engine = engine
+    return player
+
+
+@pytest.mark.parametrize("head_start", [0.1, 2.5])
+def test_waiting_on_speculation_is_charged_to_the_budget(tmp_path, head_start):
+    # Cible demandant bien plus d'une seconde de BFS : la recherche spéculative est attendue
+    # (head_start court) ou s'est déjà arrêtée sur son propre budget (head_start long)
+    board = Board(copy.deepcopy(configurations[0]), 16)
+    cache = SolverCache(cache_dir=str(tmp_path))
+    speculation = Speculation(create_player)
+    try:
+        speculation.start(board, board.robots, 2, {"BFS"})
+        time.sleep(head_start)
+        board.current_target_index = 2
+        speculation.resolve(board, {"BFS"}, cache)
+
+        player = BFSPlayer("ia", budget=SearchBudget(time_limit=1))
+        player.set_board(board)
+        start = time.monotonic()
+        result = None
+        for result in speculation.solve(player, "BFS", cache):
+            if result != "CALCULATING":
+                break
+        assert result == "BUDGET_EXCEEDED"
+        assert time.monotonic() - start < 1.5
+        # Le compte rendu est celui de la recherche spéculative, qui n'est pas recommencée
+        assert player.search_report["nodes"] > 0
+        assert cache.misses == 0
+    finally:
+        speculation.close()
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from visited import HashVisited, VisitedSetFull
+
+
+@pytest.mark.parametrize("initial_bits", [4, 16])
+@pytest.mark.parametrize("memory_cap", [1 << 10, 1 << 14, 3 * (1 << 13)])
+def test_hash_visited_stays_under_memory_cap(memory_cap, initial_bits):
+    visited = HashVisited(memory_cap=memory_cap, initial_bits=initial_bits)
+    assert visited.memory_usage() <= memory_cap
+
+    rng = random.Random(10)
+    grown = False
+    with pytest.raises(VisitedSetFull):
+        while True:
+            slots = len(visited.slots)
+            visited.add(rng.getrandbits(32))
+            assert visited.memory_usage() <= memory_cap
+            if len(visited.slots) != slots:
+                grown = True
+                # La table a grandi : l'ancienne et la nouvelle ont coexisté pendant la copie
+                assert (slots + len(visited.slots)) * visited.slots.itemsize <= memory_cap
+    assert 0 < len(visited) <= visited.MAX_LOAD * len(visited.slots)
+    assert grown == (initial_bits == 4)
+
+
+def test_hash_visited_too_small_cap():
+    with pytest.raises(VisitedSetFull):
+        HashVisited(memory_cap=64)
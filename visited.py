@@ -0,0 +1,260 @@
+import mmap
+import sys
+import tempfile
+from array import array
+
+
+def mix64(state):
+    """
+    Mélange un état compacté pour les tables de hachage et la répartition entre processus
+    (HashVisited, TranspositionTable, parallel_bfs.shard_of). Hachage multiplicatif : les bits de
+    poids faible de l'état (robot de la cible) varient peu, on garde donc les bits de poids fort
+    du résultat.
+
+    Args:
+        state (int): L'état compacté.
+
+    Returns:
+        int: Empreinte sur 64 bits.
+    """
+    return (state * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+
+
+class VisitedSetFull(MemoryError):
+    """
+    Levée quand un ensemble d'états visités atteindrait sa limite de mémoire.
+    """
+
+
+class VisitedSet:
+    """
+    Ensemble d'états visités pour les états compactés en entiers (voir Player._pack_state).
+    Les différentes implémentations ont la même interface et respectent une limite de mémoire
+    optionnelle, pour que les grosses recherches tiennent dans une quantité de RAM fixée.
+    """
+
+    def __init__(self, memory_cap=None):
+        """
+        Args:
+            memory_cap (int, optional): Mémoire maximale en octets, None pour ne pas limiter.
+        """
+        self.memory_cap = memory_cap
+
+    def add(self, state):
+        """
+        Ajoute un état s'il n'est pas déjà présent.
+
+        Args:
+            state (int): L'état compacté.
+
+        Returns:
+            bool: True si l'état est nouveau, False s'il était déjà visité.
+
+        Raises:
+            VisitedSetFull: Si l'ajout dépasserait la limite de mémoire.
+        """
+        raise NotImplementedError
+
+    def __contains__(self, state):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def memory_usage(self):
+        """
+        Renvoie la mémoire occupée par l'ensemble.
+
+        Returns:
+            int: Taille en octets.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Libère les ressources de l'ensemble (fichiers, projections mémoire).
+        """
+
+
+class SetVisited(VisitedSet):
+    """
+    Ensemble Python classique : le plus rapide, mais environ 60 octets par état.
+    """
+
+    def __init__(self, memory_cap=None):
+        super().__init__(memory_cap)
+        self.states = set()
+
+    def add(self, state):
+        if state in self.states:
+            return False
+        if self.memory_cap is not None and self.memory_usage() + sys.getsizeof(state) > self.memory_cap:
+            raise VisitedSetFull(f"{len(self.states)} états, limite de {self.memory_cap} octets atteinte")
+        self.states.add(state)
+        return True
+
+    def __contains__(self, state):
+        return state in self.states
+
+    def __len__(self):
+        return len(self.states)
+
+    def memory_usage(self):
+        # La table du set plus les entiers eux-mêmes (taille d'un entier de 32 à 60 bits)
+        return sys.getsizeof(self.states) + len(self.states) * sys.getsizeof(1 << 40)
+
+
+class HashVisited(VisitedSet):
+    """
+    Table de hachage à adressage ouvert (sondage linéaire) dans un array('Q') : 8 octets par
+    case, soit environ 11 à 16 octets par état selon le remplissage. Les états doivent tenir
+    sur 63 bits (on stocke état + 1, 0 marquant une case vide).
+    """
+
+    MAX_LOAD = 0.7
+    MIN_BITS = 4  # Plus petite table : 16 cases
+
+    def __init__(self, memory_cap=None, initial_bits=16):
+        """
+        Args:
+            memory_cap (int, optional): Mémoire maximale en octets, None pour ne pas limiter.
+            initial_bits (int): Logarithme en base 2 du nombre de cases initial, réduit si la
+                table ne tient pas dans memory_cap.
+
+        Raises:
+            VisitedSetFull: Si même la plus petite table dépasse la limite de mémoire.
+        """
+        super().__init__(memory_cap)
+        self.count = 0
+        if memory_cap is not None:
+            while initial_bits > self.MIN_BITS and (8 << initial_bits) > memory_cap:
+                initial_bits -= 1
+            if (8 << initial_bits) > memory_cap:
+                raise VisitedSetFull(f"table de {8 << initial_bits} octets, limite de {memory_cap} octets")
+        self._allocate(initial_bits)
+
+    def _allocate(self, bits):
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.slots = array("Q", [0]) * (1 << bits)
+
+    def _index(self, state):
+        return mix64(state) >> (64 - self.bits)
+
+    def _grow(self):
+        # Pendant la copie, l'ancienne et la nouvelle table (deux fois plus grande) coexistent
+        new_size = 2 << self.bits
+        if self.memory_cap is not None and (len(self.slots) + new_size) * 8 > self.memory_cap:
+            raise VisitedSetFull(f"{self.count} états, limite de {self.memory_cap} octets atteinte")
+        old_slots = self.slots
+        self._allocate(self.bits + 1)
+        for key in old_slots:
+            if key:
+                index = self._index(key - 1)
+                while self.slots[index]:
+                    index = (index + 1) & self.mask
+                self.slots[index] = key
+
+    def add(self, state):
+        key = state + 1
+        slots = self.slots
+        index = self._index(state)
+        while slots[index]:
+            if slots[index] == key:
+                return False
+            index = (index + 1) & self.mask
+
+        if self.count + 1 > self.MAX_LOAD * len(slots):
+            self._grow()
+            return self.add(state)
+
+        slots[index] = key
+        self.count += 1
+        return True
+
+    def __contains__(self, state):
+        key = state + 1
+        index = self._index(state)
+        while self.slots[index]:
+            if self.slots[index] == key:
+                return True
+            index = (index + 1) & self.mask
+        return False
+
+    def __len__(self):
+        return self.count
+
+    def memory_usage(self):
+        return len(self.slots) * self.slots.itemsize
+
+
+class BitsetVisited(VisitedSet):
+    """
+    Bitset dense d'un bit par état possible, projeté en mémoire depuis un fichier temporaire.
+    Pour 4 robots sur 16x16 (états de 32 bits) cela fait 512 Mo, quel que soit le nombre
+    d'états visités : seules les pages touchées sont réellement chargées, et le système peut
+    les renvoyer sur le disque.
+    """
+
+    def __init__(self, state_bits, memory_cap=None):
+        """
+        Args:
+            state_bits (int): Nombre de bits des états (cell_bits * nombre de robots).
+            memory_cap (int, optional): Mémoire maximale en octets, None pour ne pas limiter.
+
+        Raises:
+            VisitedSetFull: Si le bitset dépasse la limite de mémoire.
+        """
+        super().__init__(memory_cap)
+        self.size = max(1, (1 << state_bits) // 8)
+        if memory_cap is not None and self.size > memory_cap:
+            raise VisitedSetFull(f"bitset de {self.size} octets, limite de {memory_cap} octets")
+
+        self.file = tempfile.TemporaryFile()
+        self.file.truncate(self.size)  # Fichier creux : aucun bloc n'est écrit d'avance
+        self.bits = mmap.mmap(self.file.fileno(), self.size)
+        self.count = 0
+
+    def add(self, state):
+        byte, bit = state >> 3, 1 << (state & 7)
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        self.count += 1
+        return True
+
+    def __contains__(self, state):
+        return bool(self.bits[state >> 3] & (1 << (state & 7)))
+
+    def __len__(self):
+        return self.count
+
+    def memory_usage(self):
+        return self.size
+
+    def close(self):
+        self.bits.close()
+        self.file.close()
+
+
+def create_visited_set(backend, state_bits, memory_cap=None):
+    """
+    Crée un ensemble d'états visités.
+
+    Args:
+        backend (str): "set", "hash" ou "bitset".
+        state_bits (int): Nombre de bits des états compactés.
+        memory_cap (int, optional): Mémoire maximale en octets, None pour ne pas limiter.
+
+    Returns:
+        VisitedSet: L'ensemble demandé.
+    """
+    if backend == "set":
+        return SetVisited(memory_cap)
+    elif backend == "hash":
+        if state_bits > 63:
+            raise ValueError("Les états doivent tenir sur 63 bits pour la table de hachage")
+        return HashVisited(memory_cap)
+    elif backend == "bitset":
+        return BitsetVisited(state_bits, memory_cap)
+    raise ValueError(f"Type d'ensemble inconnu : {backend}")